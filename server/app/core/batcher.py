@@ -0,0 +1,91 @@
+"""
+Request batching for upstream loads
+Keys requested within a short window are dispatched as one bulk load
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+
+class BatchLoader:
+    """
+    Collects individual key lookups for `window_seconds` (or until
+    `max_batch_size` keys are pending) and resolves them all with a single
+    call to `load_many`, which returns a dict of key -> value. Keys missing
+    from that dict resolve to None; exception values are raised to that
+    key's callers only.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+        window_seconds: float = 0.01,
+        max_batch_size: int = 50,
+    ):
+        self._load_many = load_many
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.keys = 0
+
+    async def load(self, key: str) -> Any:
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            future.add_done_callback(_consume_exception)
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window_seconds, self._dispatch)
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: List[str]) -> Dict[str, Any]:
+        values = await asyncio.gather(*[self.load(key) for key in keys])
+        return dict(zip(keys, values))
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        self.batches += 1
+        self.keys += len(pending)
+        task = asyncio.ensure_future(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: Dict[str, asyncio.Future]):
+        try:
+            results = await self._load_many(list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in pending.items():
+            if future.done():
+                continue
+            value = results.get(key)
+            if isinstance(value, Exception):
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "batches": self.batches,
+            "keys": self.keys,
+            "pending": len(self._pending),
+        }
+
+
+def _consume_exception(future: asyncio.Future):
+    if not future.cancelled():
+        future.exception()
@@ -0,0 +1,82 @@
+"""
+Circuit breaker for the upstream data provider
+"""
+
+from time import monotonic
+from typing import Any, Dict
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    for `reset_timeout` seconds. Then one probe call is let through
+    (half-open): success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be rejected (open and still cooling down)"""
+        if self.state == "open":
+            return monotonic() - self._opened_at < self.reset_timeout
+        return self.state == "half_open" and self._probing
+
+    def before_call(self):
+        if self.state == "open":
+            if monotonic() - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError("upstream circuit is open")
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probing:
+                self.rejected += 1
+                raise CircuitOpenError("upstream circuit is half-open")
+            self._probing = True
+
+    def record_success(self):
+        self._failures = 0
+        self._probing = False
+        self.state = "closed"
+
+    def release_probe(self):
+        """A call let through never ran (cancelled before it started)"""
+        self._probing = False
+
+    def record_failure(self):
+        self._failures += 1
+        self._probing = False
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opened += 1
+            self.state = "open"
+            self._opened_at = monotonic()
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe may run; 0 unless open"""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.reset_timeout - (monotonic() - self._opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        retry_in = self.retry_in
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_in_seconds": round(retry_in, 1),
+        }
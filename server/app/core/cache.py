@@ -0,0 +1,125 @@
+"""
+In-memory cache with LRU eviction and an approximate memory budget
+"""
+
+import sys
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+
+class CacheEntry:
+    def __init__(self, data: Any, ttl_seconds: int = 60, grace_seconds: int = 0):
+        self.data = data
+        self.expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
+        self.stale_until = self.expires_at + timedelta(seconds=grace_seconds)
+        self.size = approx_size(data)
+
+    def is_valid(self) -> bool:
+        return datetime.now() < self.expires_at
+
+    def is_stale_servable(self) -> bool:
+        return datetime.now() < self.stale_until
+
+
+def approx_size(obj: Any) -> int:
+    """Rough deep size in bytes of JSON-like payloads (dicts, lists, scalars)"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += approx_size(key) + approx_size(value)
+    elif isinstance(obj, (list, tuple, set)):
+        for item in obj:
+            size += approx_size(item)
+    return size
+
+
+class LRUCache:
+    """
+    Bounded key/value store for CacheEntry objects. Least recently used keys
+    are evicted once either the entry count or the byte budget is exceeded,
+    and entries past their grace window are purged periodically.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        max_bytes: int = 32 * 1024 * 1024,
+        purge_interval: int = 60,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.purge_interval = timedelta(seconds=purge_interval)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._last_purge = datetime.now()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.purged = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        self._maybe_purge()
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry.is_valid():
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        self._maybe_purge()
+        self.delete(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def delete(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def purge_expired(self) -> int:
+        self._last_purge = datetime.now()
+        dead = [k for k, e in self._entries.items() if not e.is_stale_servable()]
+        for key in dead:
+            self.delete(key)
+        self.purged += len(dead)
+        return len(dead)
+
+    def _maybe_purge(self):
+        if datetime.now() - self._last_purge >= self.purge_interval:
+            self.purge_expired()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "purged": self.purged,
+        }
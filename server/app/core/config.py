@@ -2,10 +2,67 @@
 Application configuration using Pydantic Settings
 """
 
-from typing import List
+from functools import cached_property
+from typing import Dict, List, Tuple
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
+# Cache policy per key family: (ttl_seconds, stale_grace_seconds)
+DEFAULT_CACHE_POLICIES: Dict[str, Tuple[int, int]] = {
+    "stock": (30, 300),
+    "index": (30, 300),
+    "market_snapshot": (30, 300),
+    "sectors": (60, 600),
+    "news": (300, 1800),
+    "featured_news": (300, 1800),
+    "ratings": (300, 1800),
+    "earnings": (3600, 21600),
+    "dividends": (3600, 21600),
+    "week_highs_lows": (3600, 21600),
+    "info": (900, 3600),
+}
+
+# Prefetch interval per dataset: (seconds while NYSE trades incl. pre/post-market,
+# seconds while closed). A closed interval of 0 pauses the job until the next
+# session; price data is then cached until the open (see CACHE_ADAPTIVE_TTL).
+DEFAULT_PREFETCH_INTERVALS: Dict[str, Tuple[int, int]] = {
+    "indices": (25, 0),
+    "stocks": (25, 0),
+    "market_snapshot": (25, 0),
+    "sectors": (50, 0),
+    "news": (240, 1800),
+    "featured_news": (240, 1800),
+    "info": (600, 0),
+    "ratings": (240, 0),
+    "earnings": (3000, 0),
+    "dividends": (3000, 0),
+    "week_highs_lows": (3000, 0),
+}
+
+
+def parse_overrides(
+    value: str, defaults: Dict[str, Tuple[int, int]]
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Merge "name=first:second,..." overrides (second defaults to 0) into a
+    copy of `defaults`. Unknown names and malformed entries raise ValueError.
+    """
+    merged = dict(defaults)
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, sep, values = item.partition("=")
+        name = name.strip()
+        if not sep or name not in defaults:
+            raise ValueError(f"Invalid override {item.strip()!r}")
+        first, _, second = values.partition(":")
+        try:
+            merged[name] = (int(first), int(second or 0))
+        except ValueError:
+            raise ValueError(f"Invalid override {item.strip()!r}") from None
+    return merged
+
 
 class Settings(BaseSettings):
     """Application settings with environment variable support"""
@@ -18,10 +75,143 @@ class Settings(BaseSettings):
     ENV: str = "development"
     DEBUG: bool = True
 
+    # Serve expired entries during their grace window while refreshing in background
+    CACHE_STALE_WHILE_REVALIDATE: bool = True
+    # Overrides for DEFAULT_CACHE_POLICIES, e.g. "stock=15:120,news=600:3600"
+    CACHE_POLICIES_STR: str = ""
+    # In-memory cache bounds (LRU eviction) and expired-entry purge interval
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    CACHE_PURGE_INTERVAL: int = 60
+    # Market-hours aware TTLs for price data: policy TTL in the regular session,
+    # multiplied in pre/post-market, and held until the next open when closed
+    CACHE_ADAPTIVE_TTL: bool = True
+    CACHE_EXTENDED_HOURS_TTL_FACTOR: int = 2
+    CACHE_CLOSED_MAX_TTL: int = 3 * 24 * 3600
+
+    # Upstream data source: "yfinance", or "fake" for deterministic local data
+    # (load tests, benchmarks) with injected latency and errors. The fake
+    # replays FAKE_PROVIDER_REPLAY_PATH (a RecordingProvider dump) when set.
+    # "recording" is yfinance with every result kept and written to
+    # RECORDING_PATH on shutdown, to produce such a dump.
+    UPSTREAM_PROVIDER: str = "yfinance"
+    FAKE_PROVIDER_LATENCY_MS: float = 50.0
+    FAKE_PROVIDER_JITTER_MS: float = 20.0
+    FAKE_PROVIDER_ERROR_RATE: float = 0.0
+    FAKE_PROVIDER_SEED: int = 0
+    FAKE_PROVIDER_REPLAY_PATH: str = ""
+    RECORDING_PATH: str = "data/recording.json"
+
+    # Dedicated thread pool for blocking yfinance calls, and the cap on how
+    # many upstream calls may be in flight at once across all endpoints
+    UPSTREAM_MAX_WORKERS: int = 8
+    UPSTREAM_MAX_CONCURRENCY: int = 6
+
+    # Token bucket shared by all yfinance calls: sustained calls per second
+    # and burst size
+    UPSTREAM_RATE_PER_SECOND: float = 5.0
+    UPSTREAM_RATE_BURST: int = 20
+    # Circuit breaker: consecutive upstream failures before opening, and how
+    # long to serve cached data only before probing upstream again
+    UPSTREAM_BREAKER_FAILURES: int = 5
+    UPSTREAM_BREAKER_RESET_SECONDS: int = 60
+
+    # Last known good value per cache key, served marked stale when a refresh
+    # fails; persisted to SQLite every LAST_GOOD_FLUSH_SECONDS ("" = memory only)
+    LAST_GOOD_PATH: str = "data/last_good.sqlite3"
+    LAST_GOOD_FLUSH_SECONDS: float = 30.0
+
+    # SQLite file shared by uvicorn workers on one host as an L2 behind each
+    # worker's in-memory cache; one worker at a time holds a key's refresh
+    # lease and the others wait for its result. Empty = per-process cache only.
+    SHARED_CACHE_PATH: str = ""
+    SHARED_CACHE_LEASE_SECONDS: float = 15.0
+    SHARED_CACHE_POLL_SECONDS: float = 0.05
+    # Longest an L2 call waits on another worker's write lock before it is
+    # treated as a miss; the calls run on the event loop
+    SHARED_CACHE_BUSY_TIMEOUT: float = 0.05
+
+    # Per-symbol timeout for fan-out endpoints; slow symbols are dropped and the
+    # partial result is cached for UPSTREAM_PARTIAL_TTL seconds only
+    UPSTREAM_SYMBOL_TIMEOUT: float = 5.0
+    UPSTREAM_PARTIAL_TTL: int = 60
+
+    # SQLite file for persisted daily bars; empty disables the on-disk store
+    HISTORY_STORE_PATH: str = "data/history.sqlite3"
+    # Daily bars kept per symbol, and how many symbols' bars stay in memory
+    # between refreshes (only the newest bars are refetched and merged)
+    HISTORY_DAYS: int = 31
+    HISTORY_MEMORY_SYMBOLS: int = 1024
+
+    # History requests arriving within this window share one bulk yfinance download
+    UPSTREAM_BATCH_WINDOW_MS: int = 10
+    UPSTREAM_BATCH_MAX_SIZE: int = 50
+
+    # JSON file of symbols registered from ticker.info (those missing from the
+    # bundled listings); empty keeps enrichments in memory only
+    SYMBOL_CACHE_PATH: str = "data/symbols.json"
+    # How long an unknown symbol whose ticker.info came back without a name
+    # is left alone before it is looked up again (failed lookups wait
+    # UPSTREAM_PARTIAL_TTL)
+    SYMBOL_LOOKUP_RETRY_SECONDS: int = 3600
+
+    # Ticker search results memoized per (query, limit)
+    SEARCH_CACHE_SIZE: int = 1024
+
+    # Per-section deadline for /api/dashboard; slow sections come back as null
+    DASHBOARD_SECTION_TIMEOUT: float = 8.0
+
+    # Per-route request metrics middleware; /metrics is served either way
+    METRICS_ENABLED: bool = True
+
+    # Adds a Server-Timing header with per-request time in cache lookups,
+    # upstream queue wait, upstream calls, compute, validation and serialization
+    TRACING_ENABLED: bool = False
+
+    # Serves /debug/profile, a sampling profiler of every thread; keep it off
+    # on public deployments
+    PROFILER_ENABLED: bool = False
+
+    # Serialized JSON bodies kept for ETag / 304 handling, keyed by path + query
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+
+    # Background prefetcher started from the app lifespan
+    PREFETCH_ENABLED: bool = True
+    PREFETCH_TICK_SECONDS: float = 5.0
+    # Overrides for DEFAULT_PREFETCH_INTERVALS, e.g. "stocks=15:600,news=300:0"
+    PREFETCH_INTERVALS_STR: str = ""
+
+    # Live watchlist stream: one shared poll of all subscribed symbols every
+    # STREAM_INTERVAL_SECONDS, with SSE comments keeping idle connections open
+    STREAM_INTERVAL_SECONDS: float = 5.0
+    STREAM_HEARTBEAT_SECONDS: float = 15.0
+    STREAM_MAX_SYMBOLS: int = 50
+
     @property
     def ALLOWED_ORIGINS(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS_STR.split(",")]
 
+    @field_validator("CACHE_POLICIES_STR")
+    @classmethod
+    def _check_cache_policies(cls, value: str) -> str:
+        parse_overrides(value, DEFAULT_CACHE_POLICIES)
+        return value
+
+    @field_validator("PREFETCH_INTERVALS_STR")
+    @classmethod
+    def _check_prefetch_intervals(cls, value: str) -> str:
+        parse_overrides(value, DEFAULT_PREFETCH_INTERVALS)
+        return value
+
+    # Parsed once; the overrides are validated when Settings is built
+    @cached_property
+    def CACHE_POLICIES(self) -> Dict[str, Tuple[int, int]]:
+        return parse_overrides(self.CACHE_POLICIES_STR, DEFAULT_CACHE_POLICIES)
+
+    @cached_property
+    def PREFETCH_INTERVALS(self) -> Dict[str, Tuple[int, int]]:
+        return parse_overrides(self.PREFETCH_INTERVALS_STR, DEFAULT_PREFETCH_INTERVALS)
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,156 @@
+"""
+Dedicated thread pool for blocking upstream (yfinance) I/O
+"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional
+
+from app.core.breaker import CircuitBreaker, CircuitOpenError
+from app.core.metrics import UPSTREAM_CALLS, UPSTREAM_LATENCY, UPSTREAM_WAIT
+from app.core.ratelimit import TokenBucket
+from app.core.tracing import record
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], *args):
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        # The loop closed while the call ran (process shutdown)
+        pass
+
+
+def method_name(fn: Callable[..., Any]) -> str:
+    """Metrics label for an upstream call, e.g. "info" for provider.info"""
+    while isinstance(fn, partial):
+        fn = fn.func
+    return getattr(fn, "__name__", type(fn).__name__)
+
+
+class UpstreamExecutor:
+    """
+    Runs blocking calls on a bounded thread pool, with an asyncio semaphore
+    capping how many upstream calls are in flight at once. Callers beyond
+    the limit queue on the semaphore; queue depth and wait time are tracked.
+    An optional token bucket paces calls and an optional circuit breaker
+    fails them fast while upstream is erroring.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        max_concurrency: int = 6,
+        rate_limiter: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        # Keep the pool at least as large as the semaphore so calls never
+        # queue a second time inside the executor
+        self.max_workers = max(max_workers, max_concurrency)
+        self.max_concurrency = max_concurrency
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="upstream"
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.started = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        method = method_name(fn)
+        # Fail fast rather than queue behind the limiter while the circuit is open
+        if self.breaker is not None and self.breaker.is_open:
+            self.breaker.rejected += 1
+            UPSTREAM_CALLS.inc(method, "rejected")
+            raise CircuitOpenError("upstream circuit is open")
+
+        queued_at = perf_counter()
+        self.queued += 1
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        if self.breaker is not None:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self._semaphore.release()
+                UPSTREAM_CALLS.inc(method, "rejected")
+                raise
+
+        wait = perf_counter() - queued_at
+        self.started += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        UPSTREAM_WAIT.observe(wait, method)
+        record("upstream_wait", wait)
+        self.running += 1
+        loop = asyncio.get_running_loop()
+        started_at = perf_counter()
+        call = self._pool.submit(fn, *args)
+        # The slot is held until the pool thread is done, even if the caller
+        # stops waiting first, so abandoned calls still count against the cap
+        call.add_done_callback(
+            lambda call: _call_soon(loop, self._finished, method, started_at, call)
+        )
+        try:
+            return await asyncio.wrap_future(call, loop=loop)
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. a per-symbol timeout); the call itself
+            # is counted by _finished once it ends
+            UPSTREAM_CALLS.inc(method, "cancelled")
+            raise
+        finally:
+            record("upstream", perf_counter() - started_at)
+
+    def _finished(self, method: str, started_at: float, call: Future):
+        """
+        Runs on the event loop when a pool call ends, whether or not its
+        caller still waits: frees the slot and records the upstream outcome
+        """
+        self.running -= 1
+        self._semaphore.release()
+        if call.cancelled():
+            # Never started (shutdown or cancelled while queued)
+            if self.breaker is not None:
+                self.breaker.release_probe()
+            return
+        UPSTREAM_LATENCY.observe(perf_counter() - started_at, method)
+        if call.exception() is not None:
+            self.failed += 1
+            UPSTREAM_CALLS.inc(method, "error")
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            return
+        self.completed += 1
+        UPSTREAM_CALLS.inc(method, "ok")
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        avg_wait = self.total_wait / self.started if self.started else 0.0
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": round(avg_wait * 1000, 2),
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "rate_limit": self.rate_limiter.stats() if self.rate_limiter else None,
+            "breaker": self.breaker.stats() if self.breaker else None,
+        }
@@ -0,0 +1,109 @@
+"""
+Last-known-good store - the most recent good value per cache key, kept
+indefinitely and optionally persisted to SQLite so it survives restarts
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS last_good (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    as_of REAL NOT NULL
+);
+"""
+
+
+class LastGoodStore:
+    """
+    Unlike the LRU cache, entries here never expire or get evicted; they are
+    only replaced by a newer good value. Writes are kept in memory and
+    flushed to disk in batches by `flush`, which is safe to run on a thread.
+    """
+
+    def __init__(self, path: str = "", flush_interval: float = 30.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._values: Dict[str, Tuple[Any, datetime]] = {}
+        self._dirty: Dict[str, Tuple[Any, datetime]] = {}
+        self._lock = threading.Lock()
+        self._last_flush = monotonic()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            for key, data, as_of in self._conn.execute(
+                "SELECT key, data, as_of FROM last_good"
+            ):
+                self._values[key] = (
+                    json.loads(data),
+                    datetime.fromtimestamp(as_of, tz=timezone.utc),
+                )
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: str) -> Optional[Tuple[Any, datetime]]:
+        return self._values.get(key)
+
+    def set(self, key: str, data: Any):
+        value = (data, datetime.now(timezone.utc))
+        with self._lock:
+            self._values[key] = value
+            if self._conn is not None:
+                self._dirty[key] = value
+
+    @property
+    def flush_due(self) -> bool:
+        return bool(self._dirty) and (
+            monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            self._last_flush = monotonic()
+            if self._conn is None or not dirty:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO last_good (key, data, as_of) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (key, json.dumps(data, default=str), as_of.timestamp())
+                        for key, (data, as_of) in dirty.items()
+                    ],
+                )
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def mark_stale(data: Any, as_of: datetime) -> Any:
+    """
+    Copy of a cached payload with `stale: true` and `as_of` on each item:
+    dicts are marked directly, lists per element, and dicts of lists (e.g.
+    {"indices": [...], "top_movers": [...]}) per element of each list.
+    """
+    marker = {"stale": True, "as_of": as_of.isoformat().replace("+00:00", "Z")}
+    if isinstance(data, list):
+        return [mark_stale(item, as_of) for item in data]
+    if isinstance(data, dict):
+        if data and all(isinstance(value, list) for value in data.values()):
+            return {key: mark_stale(value, as_of) for key, value in data.items()}
+        return {**data, **marker}
+    return data
@@ -0,0 +1,243 @@
+"""
+Metrics - in-process counters and histograms in the Prometheus text format
+Served from /metrics; no client library or collector needed to read them
+"""
+
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds; suits both sub-millisecond cache hits and multi-second yfinance calls
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+
+    def samples(self) -> List[Tuple[str, Labels, Tuple[str, ...], float]]:
+        """(suffix, label names, label values, value) rows for rendering"""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for suffix, names, values, value in self.samples():
+            labels = _format_labels(names, values)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonic count per label set. Updated from the event loop only."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        return [("", self.labelnames, k, v) for k, v in sorted(self._values.items())]
+
+
+class Histogram(Metric):
+    """Cumulative buckets, sum and count per label set"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last), sum]
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._values.get(labels)
+        return sum(series[0]) if series else 0
+
+    def samples(self):
+        rows = []
+        bucket_names = self.labelnames + ("le",)
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                rows.append(("_bucket", bucket_names, labels + (le,), cumulative))
+            rows.append(("_sum", self.labelnames, labels, total[0]))
+            rows.append(("_count", self.labelnames, labels, cumulative))
+        return rows
+
+
+class Gauge(Metric):
+    """Current values read from a callback at scrape time"""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        collect: Callable[[], Dict[Labels, float]],
+        labelnames: Tuple[str, ...] = (),
+    ):
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+
+    def samples(self):
+        return [("", self.labelnames, k, v) for k, v in sorted(self.collect().items())]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        # Re-registering a name replaces it, so rebuilt services report live objects
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.register(
+    Counter(
+        "stogra_http_requests_total",
+        "HTTP requests by route template and status code",
+        ("method", "route", "status"),
+    )
+)
+HTTP_LATENCY = REGISTRY.register(
+    Histogram(
+        "stogra_http_request_duration_seconds",
+        "Time until response headers were sent, by route template",
+        ("method", "route"),
+    )
+)
+CACHE_LOOKUPS = REGISTRY.register(
+    Counter(
+        "stogra_cache_lookups_total",
+        "Service cache lookups by key family (stock, index, sectors, ...) and "
+        "result: hit, shared (found in the cross-worker L2), miss, expired "
+        "(reloaded) or stale (served while refreshing)",
+        ("family", "result"),
+    )
+)
+UPSTREAM_CALLS = REGISTRY.register(
+    Counter(
+        "stogra_upstream_calls_total",
+        "Upstream provider calls by method and outcome: ok, error, rejected "
+        "(circuit open) or cancelled (caller stopped waiting; the call's own "
+        "ok or error is counted when it ends)",
+        ("method", "outcome"),
+    )
+)
+UPSTREAM_LATENCY = REGISTRY.register(
+    Histogram(
+        "stogra_upstream_call_duration_seconds",
+        "Upstream provider call time on the worker pool, by method",
+        ("method",),
+    )
+)
+UPSTREAM_WAIT = REGISTRY.register(
+    Histogram(
+        "stogra_upstream_queue_wait_seconds",
+        "Time upstream calls waited for the rate limiter and a concurrency slot",
+        ("method",),
+    )
+)
+
+
+def cache_family(key: str) -> str:
+    """Key prefix before ":" (stock:AAPL -> stock); other keys are their own family"""
+    return key.split(":", 1)[0]
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latency per route template
+    (e.g. /api/stocks/{symbol}), so per-symbol paths share one series.
+    Latency is measured to the response start, which keeps long-lived SSE
+    streams from skewing the histogram.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = perf_counter()
+        recorded = False
+
+        def record(status: int):
+            nonlocal recorded
+            recorded = True
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_LATENCY.observe(perf_counter() - start, scope["method"], template)
+            HTTP_REQUESTS.inc(scope["method"], template, str(status))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                record(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not recorded:
+                record(500)
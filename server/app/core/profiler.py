@@ -0,0 +1,86 @@
+"""
+Sampling profiler - periodic snapshots of every thread's Python stack
+Output is in collapsed-stack format for flamegraph.pl or speedscope
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Dict, List
+
+# Held for the whole run of a profile, including after its caller goes away
+_running = threading.Lock()
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profile is requested while another one is running"""
+
+
+def _collapse(frame) -> str:
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "?")
+        names.append(f"{module}.{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def sample(seconds: float, interval: float = 0.005) -> Dict[str, int]:
+    """
+    Sample all other threads' stacks for `seconds`; blocking, so run it on
+    a worker thread. The event loop thread shows up like any other, with
+    its idle time in the selector's poll call.
+    """
+    me = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            stacks[f"{names.get(ident, ident)};{_collapse(frame)}"] += 1
+        time.sleep(interval)
+    return dict(stacks)
+
+
+async def profile(seconds: float, interval: float = 0.005) -> Dict[str, int]:
+    """
+    Run `sample` on its own thread, never a pool worker that upstream calls
+    or other executor jobs would queue behind. One profile at a time; a
+    second caller gets ProfilerBusyError.
+    """
+    if not _running.acquire(blocking=False):
+        raise ProfilerBusyError("a profile is already running")
+    result: Future = Future()
+
+    def run():
+        try:
+            # False if the caller went away before the thread started
+            if result.set_running_or_notify_cancel():
+                try:
+                    result.set_result(sample(seconds, interval))
+                except BaseException as e:
+                    # Delivered to the awaiting caller instead of lost here
+                    result.set_exception(e)
+        finally:
+            _running.release()
+
+    try:
+        threading.Thread(target=run, name="profiler", daemon=True).start()
+    except BaseException:
+        _running.release()
+        raise
+    return await asyncio.wrap_future(result)
+
+
+def format_collapsed(stacks: Dict[str, int], limit: int = 0) -> str:
+    """One "frame;frame;frame count" line per stack, most frequent first"""
+    ordered = sorted(stacks.items(), key=lambda item: item[1], reverse=True)
+    if limit:
+        ordered = ordered[:limit]
+    return "".join(f"{stack} {count}\n" for stack, count in ordered)
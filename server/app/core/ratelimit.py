@@ -0,0 +1,56 @@
+"""
+Token-bucket rate limiter shared by every upstream (yfinance) call
+"""
+
+import asyncio
+from time import monotonic
+from typing import Any, Dict
+
+
+class TokenBucket:
+    """
+    Allows `rate` calls per second on average with bursts of up to
+    `capacity`. Callers over the limit sleep until a token frees up.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = monotonic()
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _refill(self):
+        now = monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self):
+        started = monotonic()
+        throttled = False
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                break
+            throttled = True
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+        self.acquired += 1
+        if throttled:
+            self.throttled += 1
+            self.total_wait += monotonic() - started
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "rate_per_second": self.rate,
+            "capacity": self.capacity,
+            "tokens": round(self._tokens, 2),
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "total_wait_ms": round(self.total_wait * 1000, 2),
+        }
@@ -0,0 +1,108 @@
+"""
+Response cache - pre-serialized JSON bodies with content-hash ETags
+Cache hits skip response_model validation and JSON encoding entirely
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, NamedTuple, Optional
+
+from pydantic import TypeAdapter
+
+from app.core.cache import CacheEntry, LRUCache
+from app.core.tracing import span
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+class PreparedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """
+    Serialized bodies keyed by request (path + query). An entry is reused as
+    long as the endpoint returns the same source objects it was built from:
+    the service cache hands back identical dicts until a key is refreshed, so
+    an identity check detects changes without re-encoding anything.
+    """
+
+    # Sources are compared by identity, not age; this only bounds idle keys
+    ENTRY_TTL = 3600
+
+    def __init__(self, max_entries: int = 512):
+        self._cache = LRUCache(max_entries=max_entries)
+        self._adapters: Dict[Any, TypeAdapter] = {}
+        self.serialized = 0
+
+    def prepare(
+        self,
+        key: str,
+        payload: Any,
+        model: Optional[Any] = None,
+        exclude_unset: bool = False,
+    ) -> PreparedResponse:
+        entry = self._cache.get(key)
+        if entry is not None and _same_source(entry.data[0], payload):
+            return entry.data[1]
+        if model is not None:
+            # Same validation and filtering the response_model would apply
+            with span("validate"):
+                adapter = self._adapter(model)
+                payload_json = adapter.dump_python(
+                    adapter.validate_python(payload),
+                    mode="json",
+                    exclude_unset=exclude_unset,
+                )
+        else:
+            payload_json = payload
+        with span("serialize"):
+            body = dumps(payload_json)
+            prepared = PreparedResponse(
+                body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            )
+        self._cache.set(key, CacheEntry((payload, prepared), self.ENTRY_TTL))
+        self.serialized += 1
+        return prepared
+
+    def _adapter(self, model: Any) -> TypeAdapter:
+        adapter = self._adapters.get(model)
+        if adapter is None:
+            adapter = self._adapters[model] = TypeAdapter(model)
+        return adapter
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "serialized": self.serialized}
+
+
+def _same_source(previous: Any, current: Any) -> bool:
+    if previous is current:
+        return True
+    # List endpoints slice or assemble fresh lists of the same cached items,
+    # and composite endpoints wrap them in a fresh dict
+    if isinstance(previous, list) and isinstance(current, list):
+        return len(previous) == len(current) and all(
+            a is b for a, b in zip(previous, current)
+        )
+    if isinstance(previous, dict) and isinstance(current, dict):
+        return previous.keys() == current.keys() and all(
+            _same_source(previous[k], current[k]) for k in current
+        )
+    return False
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
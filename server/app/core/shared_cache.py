@@ -0,0 +1,184 @@
+"""
+Shared cache - an SQLite-backed L2 for the per-process LRU cache
+Lets several uvicorn workers on one host share cached data and split refreshes
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    stale_until REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class SharedEntry(NamedTuple):
+    data: Any
+    # Unix timestamps, comparable across processes
+    expires_at: float
+    stale_until: float
+
+
+class SharedCache:
+    """
+    Entries and refresh leases in one SQLite file (WAL mode), opened by
+    every worker. A lease makes one worker the owner of a key's reload;
+    the others wait for its result instead of calling upstream themselves.
+    Leases expire on their own, so a worker that dies mid-load only delays
+    the others until `lease_seconds` pass.
+
+    Methods block on SQLite and JSON, so async callers run them on
+    `executor`, a single thread: calls land in the order they were made,
+    e.g. a key's write before the release of its lease. A call waits at
+    most `busy_timeout` seconds for another worker's write lock. If the
+    file stays locked, the call degrades instead of blocking: reads miss,
+    writes are skipped (the L1 still has the value), and a lease that
+    cannot be taken is treated as taken, so this worker loads the key itself.
+    """
+
+    def __init__(
+        self, path: str, purge_interval: float = 60.0, busy_timeout: float = 0.05
+    ):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.purge_interval = purge_interval
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="shared-cache")
+        # Autocommit; each statement is its own transaction
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            # Setup may wait for other workers; request-time calls may not
+            self._conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+        self._last_purge = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.leases_acquired = 0
+        self.leases_busy = 0
+        self.locked = 0
+
+    def _fetchone(self, sql: str, params: Tuple) -> Optional[Tuple]:
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).fetchone()
+            except sqlite3.OperationalError:
+                self.locked += 1
+                return None
+
+    def _write(self, sql: str, params: Tuple) -> Optional[int]:
+        """Rows changed, or None if the database stayed locked"""
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).rowcount
+            except sqlite3.OperationalError:
+                self.locked += 1
+                return None
+
+    def get(self, key: str) -> Optional[SharedEntry]:
+        """Entry still inside its grace window, or None"""
+        row = self._fetchone(
+            "SELECT data, expires_at, stale_until FROM entries "
+            "WHERE key = ? AND stale_until > ?",
+            (key, time.time()),
+        )
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return SharedEntry(json.loads(row[0]), row[1], row[2])
+
+    def set(self, key: str, data: Any, ttl_seconds: float, grace_seconds: float = 0):
+        now = time.time()
+        encoded = json.dumps(data, separators=(",", ":"), default=str)
+        written = self._write(
+            "INSERT OR REPLACE INTO entries (key, data, expires_at, stale_until) "
+            "VALUES (?, ?, ?, ?)",
+            (key, encoded, now + ttl_seconds, now + ttl_seconds + grace_seconds),
+        )
+        if written is None:
+            return
+        self.writes += 1
+        if time.monotonic() - self._last_purge >= self.purge_interval:
+            self.purge()
+
+    def purge(self) -> int:
+        self._last_purge = time.monotonic()
+        now = time.time()
+        purged = self._write("DELETE FROM entries WHERE stale_until <= ?", (now,))
+        self._write("DELETE FROM leases WHERE expires_at <= ?", (now,))
+        return purged or 0
+
+    def acquire(self, key: str, lease_seconds: float) -> bool:
+        """
+        Take (or extend) the refresh lease on `key` unless another worker
+        holds it. True also when the database is locked: loading the key here
+        beats waiting on a lease nobody may hold.
+        """
+        now = time.time()
+        taken = self._write(
+            "INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE leases.expires_at <= ? OR leases.owner = excluded.owner",
+            (key, self.owner, now + lease_seconds, now),
+        )
+        if taken is None:
+            return True
+        if taken:
+            self.leases_acquired += 1
+        else:
+            self.leases_busy += 1
+        return bool(taken)
+
+    def release(self, key: str):
+        # If this fails the lease simply runs out
+        self._write("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self.owner))
+
+    def is_leased(self, key: str) -> bool:
+        """Whether another worker currently owns `key`'s refresh"""
+        row = self._fetchone(
+            "SELECT 1 FROM leases WHERE key = ? AND owner != ? AND expires_at > ?",
+            (key, self.owner, time.time()),
+        )
+        return row is not None
+
+    def close(self):
+        # Queued writes land before the connection goes
+        self.executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "owner": self.owner,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "leases_acquired": self.leases_acquired,
+            "leases_busy": self.leases_busy,
+            "locked": self.locked,
+        }
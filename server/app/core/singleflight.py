@@ -0,0 +1,49 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one in-flight load
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async loads by key. The first caller starts the
+    load, every caller arriving while it is running awaits the same future.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        self.calls += 1
+        future = asyncio.ensure_future(loader())
+        self._inflight[key] = future
+        future.add_done_callback(lambda f: self._forget(key, f))
+        # Shielded so a cancelled caller does not cancel the load for the others
+        return await asyncio.shield(future)
+
+    def is_inflight(self, key: str) -> bool:
+        return key in self._inflight
+
+    def _forget(self, key: str, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            future.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,99 @@
+"""
+Request tracing - per-request time spent in cache, upstream, compute and
+serialization, reported to clients through a Server-Timing header
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional
+
+# Span names in the order they appear in the header
+SPANS = ("cache", "upstream_wait", "upstream", "compute", "validate", "serialize")
+
+
+class Trace:
+    """
+    Time per span name for one request. Spans from concurrent work (a
+    gather over many symbols, background loads started by the request) are
+    summed, so they can add up to more than the request's total.
+    """
+
+    __slots__ = ("started", "durations", "counts")
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, name: str, seconds: float):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def server_timing(self) -> str:
+        names = [n for n in SPANS if n in self.durations]
+        names += [n for n in self.durations if n not in SPANS]
+        entries: List[str] = [
+            f'{name};dur={self.durations[name] * 1000:.2f};desc="x{self.counts[name]}"'
+            for name in names
+        ]
+        entries.append(f"total;dur={(perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+
+# Tasks created while a request runs (loads, refreshes) inherit its trace
+_current: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def record(name: str, seconds: float):
+    """Add an already measured duration to the active trace, if any"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block into the active trace; only a context lookup when off"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, perf_counter() - start)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware starting a Trace per HTTP request and adding its spans
+    as a Server-Timing header when the response starts
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace = Trace()
+        token = _current.set(trace)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
@@ -4,17 +4,36 @@ FastAPI backend for US equity market data via yfinance
 """
 
 from contextlib import asynccontextmanager
-from typing import List
+from typing import Any, List
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from pydantic import BaseModel
 
+from app.core.breaker import CircuitOpenError
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, REGISTRY, Gauge, MetricsMiddleware
+from app.core.profiler import ProfilerBusyError, format_collapsed, profile
+from app.core.responses import ResponseCache, dumps, etag_matches
+from app.core.tracing import TracingMiddleware
 from app.services.market_data import MarketDataService
+from app.services.prefetcher import MarketDataPrefetcher
+from app.services.streaming import StockStreamHub
 
 
 # Pydantic Schemas (matching API Contract)
+class Freshness(BaseModel):
+    # Set only when upstream failed and the last known good value is served
+    stale: bool = False
+    as_of: str | None = None
+
+
 class SearchResult(BaseModel):
     symbol: str
     name: str
@@ -22,7 +41,7 @@ class SearchResult(BaseModel):
     type: str
 
 
-class StockData(BaseModel):
+class StockData(Freshness):
     symbol: str
     name: str
     price: float
@@ -33,14 +52,14 @@ class StockData(BaseModel):
     currency: str
 
 
-class IndexSnapshot(BaseModel):
+class IndexSnapshot(Freshness):
     symbol: str
     name: str
     price: float
     change_percent: float
 
 
-class MoverStock(BaseModel):
+class MoverStock(Freshness):
     symbol: str
     name: str
     price: float
@@ -52,7 +71,7 @@ class MarketSnapshot(BaseModel):
     top_movers: List[MoverStock]
 
 
-class MarketStatus(BaseModel):
+class MarketStatus(Freshness):
     isOpen: bool
     exchange: str
     nextEvent: str
@@ -61,12 +80,12 @@ class MarketStatus(BaseModel):
     closeTime: str
 
 
-class Sector(BaseModel):
+class Sector(Freshness):
     name: str
     change_percent: float
 
 
-class NewsItem(BaseModel):
+class NewsItem(Freshness):
     title: str
     publisher: str
     link: str
@@ -74,7 +93,7 @@ class NewsItem(BaseModel):
     related_stocks: List[str]
 
 
-class AnalystRating(BaseModel):
+class AnalystRating(Freshness):
     symbol: str
     name: str
     rating: str
@@ -85,7 +104,7 @@ class AnalystRating(BaseModel):
     analyst_count: int
 
 
-class EarningEvent(BaseModel):
+class EarningEvent(Freshness):
     symbol: str
     name: str
     date: str
@@ -93,7 +112,7 @@ class EarningEvent(BaseModel):
     expected_eps: float | None
 
 
-class DividendStock(BaseModel):
+class DividendStock(Freshness):
     symbol: str
     name: str
     price: float
@@ -103,13 +122,13 @@ class DividendStock(BaseModel):
     ex_dividend_date: str
 
 
-class FeaturedNews(BaseModel):
+class FeaturedNews(Freshness):
     title: str
     symbol: str
     summary: str
 
 
-class WeekHighLow(BaseModel):
+class WeekHighLow(Freshness):
     symbol: str
     name: str
     price: float
@@ -120,13 +139,83 @@ class WeekHighLow(BaseModel):
     is_new_low: bool
 
 
+class WeekHighsLows(BaseModel):
+    highs: List[WeekHighLow]
+    lows: List[WeekHighLow]
+
+
+class Dashboard(BaseModel):
+    # Only requested sections are present; failed ones are null and in errors
+    market_snapshot: MarketSnapshot | None = None
+    status: MarketStatus | None = None
+    sectors: List[Sector] | None = None
+    news: List[NewsItem] | None = None
+    featured_news: FeaturedNews | None = None
+    ratings: List[AnalystRating] | None = None
+    earnings: List[EarningEvent] | None = None
+    dividends: List[DividendStock] | None = None
+    week_highs_lows: WeekHighsLows | None = None
+    errors: List[str]
+
+
 class HealthStatus(BaseModel):
     status: str
     version: str
+    upstream_circuit: str | None = None
 
 
 # Service instance (singleton pattern)
 market_service = MarketDataService()
+prefetcher = MarketDataPrefetcher(market_service)
+stream_hub = StockStreamHub(market_service)
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+# Gauges read the live singletons at scrape time
+REGISTRY.register(
+    Gauge(
+        "stogra_cache_entries",
+        "Entries held per in-memory cache",
+        lambda: {
+            ("service",): market_service.get_stats()["cache"]["entries"],
+            ("bars",): market_service.get_stats()["bars"]["entries"],
+            ("responses",): response_cache.stats()["entries"],
+        },
+        ("cache",),
+    )
+)
+REGISTRY.register(
+    Gauge(
+        "stogra_upstream_calls_in_progress",
+        "Upstream calls running on the worker pool or queued for a slot",
+        lambda: {
+            ("running",): market_service.get_stats()["upstream"]["running"],
+            ("queued",): market_service.get_stats()["upstream"]["queued"],
+        },
+        ("state",),
+    )
+)
+REGISTRY.register(
+    Gauge(
+        "stogra_upstream_circuit_open",
+        "1 while the upstream circuit breaker is not closed",
+        lambda: {(): float(market_service.circuit_state() != "closed")},
+    )
+)
+
+
+def cached_json(request: Request, payload: Any, model: Any = None) -> Response:
+    """
+    Send a payload as pre-serialized JSON with a content-hash ETag.
+    Answers 304 with no body when the client's If-None-Match still matches.
+    Unset optional fields (stale markers, unrequested sections) are omitted.
+    """
+    prepared = response_cache.prepare(
+        f"{request.url.path}?{request.url.query}", payload, model, exclude_unset=True
+    )
+    headers = {"ETag": prepared.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), prepared.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(prepared.body, media_type="application/json", headers=headers)
 
 
 @asynccontextmanager
@@ -134,9 +223,14 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager - startup/shutdown logic"""
     # Startup
     print("🚀 Stogra API starting up...")
+    if settings.PREFETCH_ENABLED:
+        prefetcher.start()
     yield
     # Shutdown
     print("👋 Stogra API shutting down...")
+    await stream_hub.stop()
+    await prefetcher.stop()
+    market_service.shutdown()
 
 
 # FastAPI Application
@@ -158,37 +252,113 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError) -> JSONResponse:
+    """Upstream is failing and nothing was cached to serve in its place"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Market data is temporarily unavailable"},
+        headers={"Retry-After": str(market_service.circuit_retry_after())},
+    )
+
 
 @app.get("/health", response_model=HealthStatus)
 async def health_check() -> HealthStatus:
     """
     Health check endpoint for Koyeb deployment monitoring
+    - status is "degraded" while the upstream circuit breaker is not closed
+      and responses are served from cache
     """
-    return HealthStatus(status="operational", version="1.0.0")
+    circuit = market_service.circuit_state()
+    return HealthStatus(
+        status="operational" if circuit == "closed" else "degraded",
+        version="1.0.0",
+        upstream_circuit=circuit,
+    )
+
+
+@app.get("/health/stats")
+async def service_stats():
+    """
+    Cache, request-coalescing and upstream pool counters for the market data service
+    - singleflight.shared: upstream loads saved by joining an in-flight request
+    - upstream.queued / avg_wait_ms: calls waiting for a yfinance slot
+    """
+    return {
+        **market_service.get_stats(),
+        "prefetcher": prefetcher.stats(),
+        "stream": stream_hub.stats(),
+        "responses": response_cache.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Prometheus text-format metrics
+    - stogra_http_*: request counts and latency per route template
+    - stogra_cache_lookups_total: hit/miss/expired/stale per cache key family
+    - stogra_upstream_*: provider calls, latency and queue wait per method
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.get(
+    "/debug/profile",
+    response_class=PlainTextResponse,
+    include_in_schema=settings.PROFILER_ENABLED,
+)
+async def debug_profile(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    limit: int = Query(200, ge=0, description="top stacks to return; 0 = all"),
+) -> PlainTextResponse:
+    """
+    Sample every thread's stack while the server keeps handling traffic
+    - Only available when Settings.PROFILER_ENABLED is on
+    - One profile at a time; 409 while another is running
+    - Returns collapsed stacks ("thread;frame;frame count") for flamegraph.pl
+      or speedscope
+    """
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    try:
+        stacks = await profile(seconds, interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(format_collapsed(stacks, limit))
 
 
 @app.get("/api/search", response_model=List[SearchResult])
 async def search_tickers(
+    request: Request,
     q: str = Query(..., min_length=1, max_length=50),
-) -> List[SearchResult]:
+) -> Response:
     """
     Search for stock tickers by company name or symbol
     - Debounce on frontend: 300ms
     - Max results: 5
     """
     try:
-        results = await market_service.search_tickers(q)
-        return results[:5]  # Limit to 5 results
+        results = await market_service.search_tickers(q, limit=5)
+        return cached_json(request, results, List[SearchResult])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
 
 
 @app.get("/api/stocks", response_model=List[StockData])
 async def get_stocks(
+    request: Request,
     symbols: str = Query(
         ..., description="Comma-separated stock symbols e.g., AAPL,TSLA,MSFT"
     ),
-) -> List[StockData]:
+) -> Response:
     """
     Fetch data for multiple stocks including sparkline data
     - Supports concurrent fetching via asyncio.gather
@@ -200,21 +370,70 @@ async def get_stocks(
 
     try:
         stocks = await market_service.get_stocks_batch(symbol_list)
-        return stocks
+        return cached_json(request, stocks, List[StockData])
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch stock data: {str(e)}"
         )
 
 
+@app.get("/api/stream/stocks")
+async def stream_stocks(
+    request: Request,
+    symbols: str = Query(
+        ..., description="Comma-separated stock symbols e.g., AAPL,TSLA,MSFT"
+    ),
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of live watchlist prices
+    - event "update": list of StockData whose values changed since last sent
+    - First update carries every symbol; idle periods send keep-alive comments
+    - All clients share one refresh loop, so subscribers add no upstream load
+    """
+    symbol_list = list(
+        dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip())
+    )
+
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="No symbols provided")
+    if len(symbol_list) > settings.STREAM_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.STREAM_MAX_SYMBOLS} symbols per stream",
+        )
+
+    subscription = stream_hub.subscribe(symbol_list)
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                updates = await subscription.next(settings.STREAM_HEARTBEAT_SECONDS)
+                if updates:
+                    yield f"event: update\ndata: {dumps(updates).decode()}\n\n"
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            stream_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/market/snapshot", response_model=MarketSnapshot)
-async def get_market_snapshot() -> MarketSnapshot:
+async def get_market_snapshot(request: Request) -> Response:
     """
     Get current market snapshot including major indices and top movers
     """
     try:
         snapshot = await market_service.get_market_snapshot()
-        return snapshot
+        return cached_json(request, snapshot, MarketSnapshot)
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch market snapshot: {str(e)}"
@@ -222,7 +441,7 @@ async def get_market_snapshot() -> MarketSnapshot:
 
 
 @app.get("/api/stocks/{symbol}", response_model=StockData)
-async def get_stock_detail(symbol: str) -> StockData:
+async def get_stock_detail(request: Request, symbol: str) -> Response:
     """
     Get detailed data for a single stock (optional Phase 1 feature)
     """
@@ -230,8 +449,8 @@ async def get_stock_detail(symbol: str) -> StockData:
         stock = await market_service.get_stock_detail(symbol.upper())
         if not stock:
             raise HTTPException(status_code=404, detail=f"Ticker '{symbol}' not found")
-        return stock
-    except HTTPException:
+        return cached_json(request, stock, StockData)
+    except (HTTPException, CircuitOpenError):
         raise
     except Exception as e:
         raise HTTPException(
@@ -240,13 +459,13 @@ async def get_stock_detail(symbol: str) -> StockData:
 
 
 @app.get("/api/market/status", response_model=MarketStatus)
-async def get_market_status() -> MarketStatus:
+async def get_market_status(request: Request) -> Response:
     """
     Get current market status (open/closed) based on NYSE hours
     """
     try:
         status = await market_service.get_market_status()
-        return status
+        return cached_json(request, status, MarketStatus)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch market status: {str(e)}"
@@ -254,13 +473,15 @@ async def get_market_status() -> MarketStatus:
 
 
 @app.get("/api/market/sectors", response_model=List[Sector])
-async def get_sector_performance() -> List[Sector]:
+async def get_sector_performance(request: Request) -> Response:
     """
     Get sector performance calculated from sector ETFs
     """
     try:
         sectors = await market_service.get_sector_performance()
-        return sectors
+        return cached_json(request, sectors, List[Sector])
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch sector performance: {str(e)}"
@@ -268,27 +489,32 @@ async def get_sector_performance() -> List[Sector]:
 
 
 @app.get("/api/market/news", response_model=List[NewsItem])
-async def get_news(limit: int = Query(6, ge=1, le=20)) -> List[NewsItem]:
+async def get_news(request: Request, limit: int = Query(6, ge=1, le=20)) -> Response:
     """
     Get market news from yfinance
     """
     try:
         news = await market_service.get_news(limit)
-        return news
+        return cached_json(request, news, List[NewsItem])
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch news: {str(e)}")
 
 
 @app.get("/api/market/ratings", response_model=List[AnalystRating])
 async def get_analyst_ratings(
+    request: Request,
     limit: int = Query(6, ge=1, le=20),
-) -> List[AnalystRating]:
+) -> Response:
     """
     Get analyst ratings and price targets
     """
     try:
         ratings = await market_service.get_analyst_ratings(limit=limit)
-        return ratings
+        return cached_json(request, ratings, List[AnalystRating])
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch analyst ratings: {str(e)}"
@@ -296,13 +522,17 @@ async def get_analyst_ratings(
 
 
 @app.get("/api/market/earnings", response_model=List[EarningEvent])
-async def get_earnings(limit: int = Query(8, ge=1, le=20)) -> List[EarningEvent]:
+async def get_earnings(
+    request: Request, limit: int = Query(8, ge=1, le=20)
+) -> Response:
     """
     Get upcoming earnings calendar
     """
     try:
         earnings = await market_service.get_earnings(limit)
-        return earnings
+        return cached_json(request, earnings, List[EarningEvent])
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch earnings: {str(e)}"
@@ -311,14 +541,17 @@ async def get_earnings(limit: int = Query(8, ge=1, le=20)) -> List[EarningEvent]
 
 @app.get("/api/market/dividends", response_model=List[DividendStock])
 async def get_dividend_stocks(
+    request: Request,
     limit: int = Query(6, ge=1, le=20),
-) -> List[DividendStock]:
+) -> Response:
     """
     Get dividend-paying stocks sorted by yield
     """
     try:
         dividends = await market_service.get_dividend_stocks(limit)
-        return dividends
+        return cached_json(request, dividends, List[DividendStock])
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch dividend stocks: {str(e)}"
@@ -326,13 +559,15 @@ async def get_dividend_stocks(
 
 
 @app.get("/api/market/news/featured", response_model=FeaturedNews)
-async def get_featured_news() -> FeaturedNews:
+async def get_featured_news(request: Request) -> Response:
     """
     Get featured news story
     """
     try:
         featured = await market_service.get_featured_news()
-        return featured
+        return cached_json(request, featured, FeaturedNews)
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch featured news: {str(e)}"
@@ -340,14 +575,50 @@ async def get_featured_news() -> FeaturedNews:
 
 
 @app.get("/api/market/week-highs-lows")
-async def get_week_highs_lows():
+async def get_week_highs_lows(request: Request) -> Response:
     """
     Get 52-week highs and lows
     """
     try:
         data = await market_service.get_week_highs_lows()
-        return data
+        return cached_json(request, data)
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch week highs/lows: {str(e)}"
         )
+
+
+@app.get("/api/dashboard", response_model=Dashboard, response_model_exclude_unset=True)
+async def get_dashboard(
+    request: Request,
+    fields: str = Query(
+        None,
+        description="Comma-separated sections e.g., market_snapshot,news (default: all)",
+    ),
+) -> Response:
+    """
+    Get every homepage widget in one round trip
+    - Sections load concurrently, each with its own timeout
+    - Sections that fail or time out are null and listed in "errors"
+    """
+    sections = None
+    if fields:
+        sections = list(
+            dict.fromkeys(f.strip() for f in fields.split(",") if f.strip())
+        )
+        unknown = [f for f in sections if f not in market_service.DASHBOARD_SECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown dashboard fields: {', '.join(unknown)}",
+            )
+
+    try:
+        payload, errors = await market_service.get_dashboard(sections)
+        return cached_json(request, {**payload, "errors": errors}, Dashboard)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to fetch dashboard: {str(e)}"
+        )
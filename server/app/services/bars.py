@@ -0,0 +1,127 @@
+"""
+Bar Series - compact daily OHLCV storage backed by NumPy arrays
+yfinance DataFrames are converted once at the fetch boundary
+"""
+
+import sys
+from typing import Any, Iterator, Tuple
+
+import numpy as np
+
+BAR_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class BarSeries:
+    """
+    Daily bars for one symbol as parallel arrays, oldest first. Dates are
+    naive calendar days (datetime64[D]); prices and volume are float64.
+    """
+
+    __slots__ = ("dates", "open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        dates: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+    ):
+        self.dates = dates
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def from_frame(cls, frame: Any) -> "BarSeries":
+        """Convert a yfinance history DataFrame, dropping rows without a close"""
+        index = frame.index
+        if getattr(index, "tz", None) is not None:
+            index = index.tz_localize(None)
+        dates = index.to_numpy().astype("datetime64[D]")
+        columns = [
+            (
+                frame[name].to_numpy(dtype=np.float64)
+                if name in frame.columns
+                else np.full(len(frame), np.nan)
+            )
+            for name in BAR_COLUMNS
+        ]
+        keep = ~np.isnan(columns[3])
+        return cls(dates[keep], *[column[keep] for column in columns])
+
+    @classmethod
+    def from_rows(cls, rows: list) -> "BarSeries":
+        """Build from (date, open, high, low, close, volume) tuples"""
+        if not rows:
+            return cls.empty()
+        dates, *columns = zip(*rows)
+        return cls(
+            np.array(dates, dtype="datetime64[D]"),
+            *[np.array(c, dtype=np.float64) for c in columns],
+        )
+
+    @classmethod
+    def empty(cls) -> "BarSeries":
+        return cls(np.array([], dtype="datetime64[D]"), *[np.array([])] * 5)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sum(
+            sys.getsizeof(getattr(self, name)) for name in self.__slots__
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    @property
+    def last_date(self) -> np.datetime64:
+        return self.dates[-1]
+
+    def _take(self, selector: Any) -> "BarSeries":
+        return BarSeries(*[getattr(self, name)[selector] for name in self.__slots__])
+
+    def tail(self, n: int) -> "BarSeries":
+        return self._take(slice(-n, None)) if len(self) > n else self
+
+    def merge(self, newer: "BarSeries") -> "BarSeries":
+        """Overlay newer bars; rows from `newer` win on overlapping dates"""
+        if len(newer) == 0:
+            return self
+        kept = self._take(~np.isin(self.dates, newer.dates))
+        merged = BarSeries(
+            *[
+                np.concatenate([getattr(kept, name), getattr(newer, name)])
+                for name in self.__slots__
+            ]
+        )
+        return merged._take(np.argsort(merged.dates, kind="stable"))
+
+    def same_basis(self, newer: "BarSeries", rtol: float = 1e-4) -> bool:
+        """
+        Whether `newer` agrees with these bars on the settled days both hold
+        (all but our last, which may have been fetched mid-session). Upstream
+        re-adjusts past prices after a split or dividend, so a mismatch means
+        merging would mix two price bases.
+        """
+        _, ours, theirs = np.intersect1d(
+            self.dates[:-1], newer.dates, assume_unique=True, return_indices=True
+        )
+        return bool(np.allclose(self.close[ours], newer.close[theirs], rtol=rtol))
+
+    def rows(self) -> Iterator[Tuple[str, float, float, float, float, float]]:
+        for i, date in enumerate(self.dates):
+            yield (
+                str(date),
+                *[_nullable(getattr(self, name)[i]) for name in self.__slots__[1:]],
+            )
+
+
+def _nullable(value: float) -> Any:
+    return None if np.isnan(value) else float(value)
@@ -0,0 +1,277 @@
+"""
+Fake Provider - deterministic local market data for load tests and benchmarks
+Serves recorded payloads where available and synthetic ones otherwise
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.services.bars import BarSeries
+from app.services.providers import EarningsDate, MarketDataProvider
+
+PERIOD_DAYS = {"5d": 7, "1mo": 31, "3mo": 92, "6mo": 183, "1y": 366}
+
+RECOMMENDATIONS = ("strong_buy", "buy", "buy", "hold", "hold", "sell")
+SECTORS = ("Technology", "Financial Services", "Healthcare", "Energy", "Consumer")
+PUBLISHERS = ("Reuters", "Bloomberg", "MarketWatch", "Barron's", "CNBC")
+HEADLINES = (
+    "{symbol} shares move as investors weigh quarterly outlook",
+    "Analysts revisit {symbol} price targets ahead of earnings",
+    "{symbol} draws attention in a busy session for large caps",
+    "What the latest guidance means for {symbol}",
+)
+
+
+class FakeProvider(MarketDataProvider):
+    """
+    Synthetic data is a pure function of (seed, symbol, date): the same
+    request always returns the same bars, info, news and earnings, so
+    incremental history fetches line up with earlier full ones. Each call
+    sleeps `latency_ms` +/- `jitter_ms` and fails with probability
+    `error_rate` (with a throttling message, so the breaker counts it).
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        replay_path: str = "",
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self._replay: Dict[str, Dict[str, Any]] = {}
+        if replay_path:
+            with open(replay_path, encoding="utf-8") as f:
+                self._replay = json.load(f)
+        # Latency and error draws share one sequence, guarded across threads
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def _rng(self, *parts: Any) -> random.Random:
+        return random.Random(":".join(str(p) for p in (self.seed, *parts)))
+
+    def _call(self, method: str):
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            delay = self.latency_ms + self._random.uniform(
+                -self.jitter_ms, self.jitter_ms
+            )
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors[method] = self.errors.get(method, 0) + 1
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if fail:
+            raise RuntimeError(
+                f"Fake upstream error in {method}: 429 Too Many Requests"
+            )
+
+    def _recorded(self, section: str, symbol: str) -> Optional[Any]:
+        return self._replay.get(section, {}).get(symbol)
+
+    # Synthetic prices: a slow per-symbol cycle plus stateless daily noise
+
+    def _base_price(self, symbol: str) -> float:
+        if symbol.startswith("^"):
+            return self._rng(symbol, "base").uniform(4000, 40000)
+        return self._rng(symbol, "base").uniform(15, 600)
+
+    def _close(self, symbol: str, day: date) -> float:
+        phase = self._rng(symbol, "phase").uniform(0, 2 * math.pi)
+        cycle = 1 + 0.12 * math.sin(day.toordinal() / 25 + phase)
+        noise = 1 + self._rng(symbol, day).uniform(-0.015, 0.015)
+        return self._base_price(symbol) * cycle * noise
+
+    def _bar(self, symbol: str, day: date) -> tuple:
+        rng = self._rng(symbol, day, "bar")
+        close = self._close(symbol, day)
+        open_ = close * (1 + rng.uniform(-0.01, 0.01))
+        high = max(open_, close) * (1 + rng.uniform(0, 0.01))
+        low = min(open_, close) * (1 - rng.uniform(0, 0.01))
+        volume = float(rng.randint(1_000_000, 80_000_000))
+        return (day.isoformat(), open_, high, low, close, volume)
+
+    @staticmethod
+    def _trading_days(start: date, end: date) -> List[date]:
+        days = (start + timedelta(days=i) for i in range((end - start).days + 1))
+        return [day for day in days if day.weekday() < 5]
+
+    def history(
+        self, symbols: List[str], period: str = "1mo", start: Optional[str] = None
+    ) -> Dict[str, BarSeries]:
+        self._call("history")
+        today = datetime.now(timezone.utc).date()
+        first = (
+            date.fromisoformat(start)
+            if start
+            else today - timedelta(days=PERIOD_DAYS.get(period, 31))
+        )
+        histories = {}
+        for symbol in symbols:
+            recorded = self._recorded("history", symbol)
+            if recorded is not None:
+                rows = [row for row in recorded if row[0] >= first.isoformat()]
+            else:
+                rows = [
+                    self._bar(symbol, day) for day in self._trading_days(first, today)
+                ]
+            if rows:
+                histories[symbol] = BarSeries.from_rows(rows)
+        return histories
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        self._call("info")
+        recorded = self._recorded("info", symbol)
+        if recorded is not None:
+            return recorded
+        rng = self._rng(symbol, "info")
+        today = datetime.now(timezone.utc).date()
+        price = self._close(symbol, today)
+        year = [
+            self._close(symbol, today - timedelta(days=i)) for i in range(0, 365, 3)
+        ]
+        dividend_yield = rng.uniform(0.005, 0.06) if rng.random() < 0.5 else None
+        ex_dividend = today + timedelta(days=rng.randint(1, 90))
+        return {
+            "shortName": symbol,
+            "longName": f"{symbol.lstrip('^')} Holdings Inc.",
+            "exchange": "NMS",
+            "quoteType": "INDEX" if symbol.startswith("^") else "EQUITY",
+            "sector": rng.choice(SECTORS),
+            "currency": "USD",
+            "currentPrice": round(price, 2),
+            "regularMarketPrice": round(price, 2),
+            "fiftyTwoWeekHigh": round(max(year), 2),
+            "fiftyTwoWeekLow": round(min(year), 2),
+            "recommendationKey": rng.choice(RECOMMENDATIONS),
+            "targetMedianPrice": round(price * rng.uniform(0.9, 1.3), 2),
+            "targetMeanPrice": round(price * rng.uniform(0.9, 1.3), 2),
+            "numberOfAnalystOpinions": rng.randint(5, 50),
+            "dividendYield": dividend_yield and round(dividend_yield, 4),
+            "dividendRate": dividend_yield and round(price * dividend_yield, 2),
+            "exDividendDate": dividend_yield
+            and int(datetime(*ex_dividend.timetuple()[:3]).timestamp()),
+        }
+
+    def news(self, symbol: str) -> List[Dict[str, Any]]:
+        self._call("news")
+        recorded = self._recorded("news", symbol)
+        if recorded is not None:
+            return recorded
+        today = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        rng = self._rng(symbol, today.date(), "news")
+        items = []
+        for i in range(3):
+            published = today + timedelta(minutes=rng.randint(0, 24 * 60 - 1))
+            items.append(
+                {
+                    "title": rng.choice(HEADLINES).format(symbol=symbol),
+                    "publisher": rng.choice(PUBLISHERS),
+                    "link": f"https://example.com/news/{symbol.lower()}/{i}",
+                    "providerPublishTime": int(published.timestamp()),
+                }
+            )
+        return items
+
+    def earnings_dates(self, symbol: str) -> List[EarningsDate]:
+        self._call("earnings_dates")
+        recorded = self._recorded("earnings_dates", symbol)
+        if recorded is not None:
+            return [(datetime.fromisoformat(d), eps) for d, eps in recorded]
+        rng = self._rng(symbol, "earnings")
+        today = datetime.now(timezone.utc).replace(
+            hour=21, minute=0, second=0, microsecond=0
+        )
+        upcoming = today + timedelta(days=rng.randint(1, 90))
+        eps = round(rng.uniform(0.2, 4.0), 2)
+        return [(upcoming + timedelta(days=91 * q), eps) for q in range(-4, 2)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"calls": dict(self.calls), "errors": dict(self.errors)}
+
+
+class RecordingProvider(MarketDataProvider):
+    """
+    Pass-through to another provider that keeps every result, so a real
+    session can be saved with `save` (to `path` on close, when given) and
+    replayed offline by FakeProvider
+    """
+
+    name = "recording"
+
+    def __init__(self, inner: MarketDataProvider, path: str = ""):
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+        self.recorded: Dict[str, Dict[str, Any]] = {
+            "history": {},
+            "info": {},
+            "news": {},
+            "earnings_dates": {},
+        }
+
+    @property
+    def history_batch_size(self) -> Optional[int]:
+        return self.inner.history_batch_size
+
+    def _keep(self, section: str, symbol: str, value: Any):
+        with self._lock:
+            self.recorded[section][symbol] = value
+
+    def history(
+        self, symbols: List[str], period: str = "1mo", start: Optional[str] = None
+    ) -> Dict[str, BarSeries]:
+        histories = self.inner.history(symbols, period, start)
+        for symbol, bars in histories.items():
+            rows = {row[0]: list(row) for row in bars.rows()}
+            with self._lock:
+                previous = self.recorded["history"].get(symbol, [])
+                merged = {row[0]: row for row in previous}
+                merged.update(rows)
+                self.recorded["history"][symbol] = sorted(merged.values())
+        return histories
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        info = self.inner.info(symbol)
+        self._keep("info", symbol, info)
+        return info
+
+    def news(self, symbol: str) -> List[Dict[str, Any]]:
+        news = self.inner.news(symbol)
+        self._keep("news", symbol, news)
+        return news
+
+    def earnings_dates(self, symbol: str) -> List[EarningsDate]:
+        dates = self.inner.earnings_dates(symbol)
+        self._keep("earnings_dates", symbol, [[d.isoformat(), e] for d, e in dates])
+        return dates
+
+    def close(self):
+        self.inner.close()
+        if self.path:
+            self.save(self.path)
+            print(f"Recorded upstream results to {self.path}")
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.recorded, f, default=str)
@@ -0,0 +1,123 @@
+"""
+History Store - persistent daily OHLCV bars on local disk (SQLite)
+Lets a restarted instance serve sparklines without refetching a month of bars
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple
+
+from app.services.bars import BarSeries
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL NOT NULL,
+    volume REAL,
+    PRIMARY KEY (symbol, interval, date)
+);
+CREATE TABLE IF NOT EXISTS fetches (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (symbol, interval)
+);
+"""
+
+
+class StoredHistory(NamedTuple):
+    bars: BarSeries
+    fetched_at: datetime
+
+
+class HistoryStore:
+    """
+    SQLite table of bars keyed by (symbol, interval, date), plus the time
+    each symbol was last fetched from upstream. Only the newest `days` bars
+    per symbol are kept; older ones are deleted whenever a symbol is saved.
+    Safe to call from the upstream thread pool; access is serialized
+    through one connection.
+    """
+
+    def __init__(self, path: str, days: int = 31):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.days = days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def load_many(
+        self, symbols: List[str], interval: str = "1d"
+    ) -> Dict[str, StoredHistory]:
+        stored = {}
+        with self._lock:
+            for symbol in symbols:
+                fetched = self._conn.execute(
+                    "SELECT fetched_at FROM fetches WHERE symbol = ? AND interval = ?",
+                    (symbol, interval),
+                ).fetchone()
+                if fetched is None:
+                    continue
+                rows = self._conn.execute(
+                    "SELECT date, open, high, low, close, volume FROM bars "
+                    "WHERE symbol = ? AND interval = ? ORDER BY date DESC LIMIT ?",
+                    (symbol, interval, self.days),
+                ).fetchall()
+                if not rows:
+                    continue
+                rows.reverse()
+                stored[symbol] = StoredHistory(
+                    BarSeries.from_rows(rows),
+                    datetime.fromtimestamp(fetched[0], tz=timezone.utc),
+                )
+        return stored
+
+    def save_many(
+        self,
+        histories: Dict[str, BarSeries],
+        interval: str = "1d",
+        replace: Iterable[str] = (),
+    ):
+        """Upsert bars; symbols in `replace` (re-adjusted prices) drop their old rows first"""
+        fetched_at = datetime.now(timezone.utc).timestamp()
+        replace = set(replace)
+        with self._lock, self._conn:
+            for symbol, bars in histories.items():
+                if symbol in replace:
+                    self._conn.execute(
+                        "DELETE FROM bars WHERE symbol = ? AND interval = ?",
+                        (symbol, interval),
+                    )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO bars "
+                    "(symbol, interval, date, open, high, low, close, volume) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(symbol, interval, *row) for row in bars.rows()],
+                )
+                self._conn.execute(
+                    "DELETE FROM bars WHERE symbol = ? AND interval = ? AND date < ("
+                    "SELECT date FROM bars WHERE symbol = ? AND interval = ? "
+                    "ORDER BY date DESC LIMIT 1 OFFSET ?)",
+                    (symbol, interval, symbol, interval, self.days - 1),
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO fetches (symbol, interval, fetched_at) "
+                    "VALUES (?, ?, ?)",
+                    (symbol, interval, fetched_at),
+                )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -4,19 +4,35 @@ Handles all interactions with Yahoo Finance API
 """
 
 import asyncio
-from datetime import datetime, time, timedelta
-from typing import List, Dict, Any, Optional
-import yfinance as yf
+import math
+from datetime import datetime, time, timedelta, timezone
+from functools import partial
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Set, Tuple
 import pytz
 
-
-class CacheEntry:
-    def __init__(self, data: Any, ttl_seconds: int = 60):
-        self.data = data
-        self.expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
-
-    def is_valid(self) -> bool:
-        return datetime.now() < self.expires_at
+from app.core.batcher import BatchLoader
+from app.core.breaker import CircuitBreaker, CircuitOpenError
+from app.core.cache import CacheEntry, LRUCache
+from app.core.config import settings
+from app.core.executor import UpstreamExecutor
+from app.core.last_good import LastGoodStore, mark_stale
+from app.core.metrics import CACHE_LOOKUPS, cache_family
+from app.core.ratelimit import TokenBucket
+from app.core.shared_cache import SharedCache
+from app.core.singleflight import SingleFlight
+from app.core.tracing import span
+from app.services.bars import BarSeries
+from app.services.history_store import HistoryStore, StoredHistory
+from app.services.providers import MarketDataProvider, create_provider
+from app.services.quotes import summarize_histories
+from app.services.search import TickerSearchIndex
+from app.services.symbols import SymbolInfo, SymbolRegistry
+
+NYSE_TZ = pytz.timezone("America/New_York")
+PRE_MARKET_OPEN = time(4, 0)
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+POST_MARKET_CLOSE = time(20, 0)
 
 
 class MarketDataService:
@@ -24,8 +40,6 @@ class MarketDataService:
     Service layer for fetching and processing market data from yfinance
     """
 
-    _cache: Dict[str, CacheEntry] = {}
-
     INDICES = {
         "^GSPC": "S&P 500",
         "^IXIC": "Nasdaq",
@@ -60,266 +74,783 @@ class MarketDataService:
 
     NEWS_SYMBOLS = ["NVDA", "AAPL", "TSLA", "META", "AMZN", "MSFT", "GOOGL"]
 
-    STOCK_NAMES = {
-        "AAPL": "Apple Inc.",
-        "MSFT": "Microsoft Corporation",
-        "GOOGL": "Alphabet Inc. Class A",
-        "AMZN": "Amazon.com Inc.",
-        "NVDA": "NVIDIA Corporation",
-        "META": "Meta Platforms Inc.",
-        "TSLA": "Tesla Inc.",
-        "BRK-B": "Berkshire Hathaway Inc.",
-        "UNH": "UnitedHealth Group Inc.",
-        "JNJ": "Johnson & Johnson",
-        "XOM": "Exxon Mobil Corporation",
-        "V": "Visa Inc.",
-        "JPM": "JPMorgan Chase & Co.",
-        "WMT": "Walmart Inc.",
-        "PG": "Procter & Gamble Co.",
-        "MA": "Mastercard Inc.",
-        "HD": "Home Depot Inc.",
-        "CVX": "Chevron Corporation",
-        "KO": "Coca-Cola Co.",
-        "PFE": "Pfizer Inc.",
-        "NFLX": "Netflix Inc.",
-        "AMD": "Advanced Micro Devices Inc.",
-        "ADBE": "Adobe Inc.",
-        "CRM": "Salesforce Inc.",
-        "INTC": "Intel Corporation",
-        "IBM": "IBM Corporation",
-        "T": "AT&T Inc.",
-        "VZ": "Verizon Communications Inc.",
-        "MO": "Altria Group Inc.",
+    DIVIDEND_SYMBOLS = ["XOM", "CVX", "KO", "JNJ", "PG", "PFE", "VZ", "T", "IBM", "MO"]
+
+    # Homepage widgets served together by /api/dashboard, in response order
+    DASHBOARD_SECTIONS = [
+        "market_snapshot",
+        "status",
+        "sectors",
+        "news",
+        "featured_news",
+        "ratings",
+        "earnings",
+        "dividends",
+        "week_highs_lows",
+    ]
+
+    # Cache families whose data only changes while NYSE trades (incl. pre/post)
+    MARKET_HOURS_FAMILIES = {
+        "stock",
+        "index",
+        "market_snapshot",
+        "sectors",
+        "info",
+        "dividends",
+        "week_highs_lows",
     }
 
-    def _get_cached(self, key: str) -> Optional[Any]:
-        entry = self._cache.get(key)
-        if entry and entry.is_valid():
+    # Subset of ticker.info kept in the shared info store
+    INFO_FIELDS = (
+        "shortName",
+        "currentPrice",
+        "regularMarketPrice",
+        "recommendationKey",
+        "targetMedianPrice",
+        "targetMeanPrice",
+        "numberOfAnalystOpinions",
+        "dividendYield",
+        "dividendRate",
+        "exDividendDate",
+        "fiftyTwoWeekHigh",
+        "fiftyTwoWeekLow",
+        # Used to register symbols missing from the listings file
+        "longName",
+        "exchange",
+        "quoteType",
+        "sector",
+        "currency",
+    )
+
+    def __init__(self, provider: Optional[MarketDataProvider] = None):
+        self._provider = provider or create_provider(settings.UPSTREAM_PROVIDER)
+        self._cache = LRUCache(
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            max_bytes=settings.CACHE_MAX_BYTES,
+            purge_interval=settings.CACHE_PURGE_INTERVAL,
+        )
+        self._singleflight = SingleFlight()
+        # L2 shared by uvicorn workers on this host; the LRU above is the L1
+        self._shared = (
+            SharedCache(
+                settings.SHARED_CACHE_PATH,
+                settings.CACHE_PURGE_INTERVAL,
+                settings.SHARED_CACHE_BUSY_TIMEOUT,
+            )
+            if settings.SHARED_CACHE_PATH
+            else None
+        )
+        self._upstream = UpstreamExecutor(
+            max_workers=settings.UPSTREAM_MAX_WORKERS,
+            max_concurrency=settings.UPSTREAM_MAX_CONCURRENCY,
+            rate_limiter=TokenBucket(
+                settings.UPSTREAM_RATE_PER_SECOND, settings.UPSTREAM_RATE_BURST
+            ),
+            breaker=CircuitBreaker(
+                settings.UPSTREAM_BREAKER_FAILURES,
+                settings.UPSTREAM_BREAKER_RESET_SECONDS,
+            ),
+        )
+        self._quote_loader = BatchLoader(
+            self._load_quotes,
+            window_seconds=settings.UPSTREAM_BATCH_WINDOW_MS / 1000,
+            max_batch_size=settings.UPSTREAM_BATCH_MAX_SIZE,
+        )
+        # Per-symbol daily bars kept between refreshes for incremental updates
+        self._bars = LRUCache(
+            max_entries=settings.HISTORY_MEMORY_SYMBOLS,
+            max_bytes=settings.CACHE_MAX_BYTES,
+            purge_interval=settings.CACHE_PURGE_INTERVAL,
+        )
+        self._history_store = (
+            HistoryStore(settings.HISTORY_STORE_PATH, settings.HISTORY_DAYS)
+            if settings.HISTORY_STORE_PATH
+            else None
+        )
+        self._symbols = SymbolRegistry(settings.SYMBOL_CACHE_PATH)
+        # Built from the registry on the first search
+        self._search_index: Optional[TickerSearchIndex] = None
+        # Previous good value per cache key, served marked stale on failure
+        self._last_good = LastGoodStore(
+            settings.LAST_GOOD_PATH, settings.LAST_GOOD_FLUSH_SECONDS
+        )
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        # In-flight disk flushes by store name
+        self._flushes: Dict[str, asyncio.Future] = {}
+        self._cache_counters = {
+            "stale_served": 0,
+            "background_refreshes": 0,
+            "breaker_fallbacks": 0,
+            "last_good_served": 0,
+            "shared_waits": 0,
+            "shared_wait_hits": 0,
+        }
+
+    def _cache_policy(self, key: str) -> Tuple[int, int]:
+        family = key.split(":", 1)[0]
+        return settings.CACHE_POLICIES.get(family, (60, 0))
+
+    def _get_cached(
+        self, key: str, refresh: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> Optional[Any]:
+        """
+        Return fresh cached data. When a refresh loader is given and the entry
+        is expired but still inside its grace window, return the stale data
+        and refresh it in the background. While the upstream circuit is open,
+        the last known good value is returned (marked stale), however old.
+        Only the in-memory L1 is read here; a miss checks the shared L2 in
+        _load_once, off the event loop.
+        """
+        with span("cache"):
+            family = cache_family(key)
+            entry = self._cache.get(key)
+            if entry is not None and entry.is_valid():
+                CACHE_LOOKUPS.inc(family, "hit")
+                return entry.data
+            if self._upstream.breaker.is_open:
+                # Upstream calls would be rejected; any previous value beats none
+                stale = self._stale_value(key)
+                if stale is not None:
+                    self._cache_counters["breaker_fallbacks"] += 1
+                CACHE_LOOKUPS.inc(family, "miss" if stale is None else "stale")
+                return stale
+            if not entry:
+                CACHE_LOOKUPS.inc(family, "miss")
+                return None
+            if (
+                refresh is not None
+                and settings.CACHE_STALE_WHILE_REVALIDATE
+                and entry.is_stale_servable()
+            ):
+                self._cache_counters["stale_served"] += 1
+                CACHE_LOOKUPS.inc(family, "stale")
+                self._schedule_refresh(key, refresh)
+                return entry.data
+            CACHE_LOOKUPS.inc(family, "expired")
+            return None
+
+    def _set_cached(
+        self,
+        key: str,
+        data: Any,
+        ttl_seconds: Optional[int] = None,
+        complete: bool = True,
+    ):
+        """
+        Store `data` in the L1 (and L2). Only complete results replace the
+        last known good value; a fan-out that dropped symbols is cached
+        briefly but never stands in for a full one after a later failure.
+        """
+        ttl, grace = self._cache_policy(key)
+        if ttl_seconds is not None:
+            ttl = ttl_seconds
+        elif (
+            settings.CACHE_ADAPTIVE_TTL
+            and key.split(":", 1)[0] in self.MARKET_HOURS_FAMILIES
+        ):
+            ttl = self._market_hours_ttl(ttl)
+        self._cache.set(key, CacheEntry(data, ttl, grace))
+        if self._shared is not None:
+            # Queued on the L2's thread ahead of this load's lease release
+            loop = asyncio.get_running_loop()
+            write = loop.run_in_executor(
+                self._shared.executor,
+                partial(self._shared.set, key, data, ttl, grace),
+            )
+            write.add_done_callback(self._on_shared_write_done)
+        if data and complete:
+            self._last_good.set(key, data)
+            self._flush_in_background(
+                "last_good", self._last_good.flush, lambda: self._last_good.flush_due
+            )
+
+    def _on_shared_write_done(self, future: asyncio.Future):
+        if not future.cancelled() and future.exception():
+            print(f"Error writing shared cache: {future.exception()}")
+
+    async def _shared_call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a SharedCache method on its thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._shared.executor, partial(fn, *args))
+
+    async def _from_shared(self, key: str) -> Optional[CacheEntry]:
+        """Copy another worker's entry for `key` from the L2 into the L1"""
+        shared = await self._shared_call(self._shared.get, key)
+        if shared is None:
+            return None
+        now = datetime.now().timestamp()
+        entry = CacheEntry(
+            shared.data,
+            shared.expires_at - now,
+            shared.stale_until - shared.expires_at,
+        )
+        self._cache.set(key, entry)
+        if shared.data and entry.is_valid():
+            # So this worker can serve it as last known good, too
+            self._last_good.set(key, shared.data)
+        return entry
+
+    async def _load_once(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Load `key` once per process (single-flight) and, with a shared
+        cache, once per host: a fresh L2 entry from another worker is used
+        as is, else only the worker holding the key's lease calls the
+        loader and the others wait for its result to land in the L2.
+        """
+        if self._shared is None:
+            return await self._singleflight.do(key, loader)
+        return await self._singleflight.do(key, partial(self._load_owned, key, loader))
+
+    async def _load_owned(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = await self._from_shared(key)
+        if entry is not None and entry.is_valid():
+            CACHE_LOOKUPS.inc(cache_family(key), "shared")
             return entry.data
-        return None
 
-    def _set_cached(self, key: str, data: Any, ttl_seconds: int = 60):
-        self._cache[key] = CacheEntry(data, ttl_seconds)
+        lease = settings.SHARED_CACHE_LEASE_SECONDS
+        if await self._shared_call(self._shared.acquire, key, lease):
+            try:
+                return await loader()
+            finally:
+                await self._shared_call(self._shared.release, key)
+
+        self._cache_counters["shared_waits"] += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + lease
+        while loop.time() < deadline:
+            await asyncio.sleep(settings.SHARED_CACHE_POLL_SECONDS)
+            entry = await self._from_shared(key)
+            if entry is not None and entry.is_valid():
+                self._cache_counters["shared_wait_hits"] += 1
+                return entry.data
+            if not await self._shared_call(self._shared.is_leased, key):
+                break
+        # The owner failed or gave up without storing a result; load it here
+        return await loader()
+
+    def _stale_value(self, key: str) -> Optional[Any]:
+        """Last known good value for `key` marked stale, or None if never loaded"""
+        last_good = self._last_good.get(key)
+        if last_good is None:
+            return None
+        return mark_stale(*last_good)
+
+    def _serve_last_good(self, key: str, default: Any = None) -> Any:
+        """
+        Fallback for a failed load: the last known good value marked stale.
+        It is cached for UPSTREAM_PARTIAL_TTL so the failing upstream is
+        retried soon, but not by every request in the meantime. With no
+        previous value while the circuit is open, CircuitOpenError is raised
+        instead of returning `default`, which would pass for real data.
+        """
+        stale = self._stale_value(key)
+        if stale is None:
+            if self._upstream.breaker.is_open:
+                raise CircuitOpenError("upstream circuit is open")
+            return default
+        self._cache_counters["last_good_served"] += 1
+        self._cache.set(key, CacheEntry(stale, settings.UPSTREAM_PARTIAL_TTL))
+        return stale
+
+    def _market_hours_ttl(self, ttl: int) -> int:
+        """
+        Regular session: the policy TTL. Pre/post-market: a multiple of it.
+        Closed: until the next pre-market open, capped by CACHE_CLOSED_MAX_TTL.
+        """
+        now = datetime.now(NYSE_TZ)
+        session = self.market_session(now)
+        if session == "regular":
+            return ttl
+        if session in ("pre", "post"):
+            return ttl * settings.CACHE_EXTENDED_HOURS_TTL_FACTOR
+        until_next = self._seconds_until_next_session(now)
+        return max(ttl, min(until_next, settings.CACHE_CLOSED_MAX_TTL))
+
+    def _schedule_refresh(self, key: str, refresh: Callable[[], Awaitable[Any]]):
+        if self._singleflight.is_inflight(key):
+            return
+        self._cache_counters["background_refreshes"] += 1
+        task = asyncio.ensure_future(self._load_once(key, refresh))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._on_refresh_done)
+
+    def _on_refresh_done(self, task: asyncio.Task):
+        self._refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"Error refreshing cache in background: {task.exception()}")
+
+    def _flush_in_background(
+        self, name: str, flush: Callable[[], None], due: Callable[[], bool]
+    ):
+        """
+        Run a store's `flush` on a worker thread when `due()`, one at a time
+        per store; a flush that finds more work due on completion runs again
+        """
+        if name in self._flushes or not due():
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, flush)
+        self._flushes[name] = future
+        future.add_done_callback(partial(self._on_flush_done, name, flush, due))
+
+    def _on_flush_done(
+        self,
+        name: str,
+        flush: Callable[[], None],
+        due: Callable[[], bool],
+        future: asyncio.Future,
+    ):
+        del self._flushes[name]
+        if not future.cancelled() and future.exception():
+            print(f"Error flushing {name} to disk: {future.exception()}")
+        self._flush_in_background(name, flush, due)
+
+    def shutdown(self):
+        self._upstream.shutdown()
+        self._provider.close()
+        self._last_good.close()
+        self._symbols.flush()
+        if self._shared is not None:
+            self._shared.close()
+        if self._history_store is not None:
+            self._history_store.close()
+
+    def circuit_state(self) -> str:
+        """Upstream circuit breaker state: closed, open or half_open"""
+        return self._upstream.breaker.state
+
+    def circuit_retry_after(self) -> int:
+        """Whole seconds until the breaker lets upstream calls through again"""
+        return max(1, math.ceil(self._upstream.breaker.retry_in))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cache": self._cache.stats(),
+            "bars": self._bars.stats(),
+            "last_good_keys": len(self._last_good),
+            "shared_cache": self._shared.stats() if self._shared else None,
+            **self._cache_counters,
+            "singleflight": self._singleflight.stats(),
+            "history_batches": self._quote_loader.stats(),
+            "upstream": self._upstream.stats(),
+            "symbols": self._symbols.stats(),
+            "search": self._search_index.cache_info() if self._search_index else {},
+        }
 
-    async def search_tickers(self, query: str) -> List[Dict[str, str]]:
-        common_stocks = [
-            {
-                "symbol": "AAPL",
-                "name": "Apple Inc.",
-                "exchange": "NASDAQ",
-                "type": "Equity",
-            },
-            {
-                "symbol": "MSFT",
-                "name": "Microsoft Corporation",
-                "exchange": "NASDAQ",
-                "type": "Equity",
-            },
-            {
-                "symbol": "GOOGL",
-                "name": "Alphabet Inc. Class A",
-                "exchange": "NASDAQ",
-                "type": "Equity",
-            },
-            {
-                "symbol": "AMZN",
-                "name": "Amazon.com Inc.",
-                "exchange": "NASDAQ",
-                "type": "Equity",
-            },
-            {
-                "symbol": "NVDA",
-                "name": "NVIDIA Corporation",
-                "exchange": "NASDAQ",
-                "type": "Equity",
-            },
-            {
-                "symbol": "META",
-                "name": "Meta Platforms Inc.",
-                "exchange": "NASDAQ",
-                "type": "Equity",
-            },
-            {
-                "symbol": "TSLA",
-                "name": "Tesla Inc.",
-                "exchange": "NASDAQ",
-                "type": "Equity",
-            },
-            {
-                "symbol": "BRK-B",
-                "name": "Berkshire Hathaway Inc.",
-                "exchange": "NYSE",
-                "type": "Equity",
-            },
-            {
-                "symbol": "JNJ",
-                "name": "Johnson & Johnson",
-                "exchange": "NYSE",
-                "type": "Equity",
-            },
-            {
-                "symbol": "JPM",
-                "name": "JPMorgan Chase & Co.",
-                "exchange": "NYSE",
-                "type": "Equity",
-            },
-            {"symbol": "V", "name": "Visa Inc.", "exchange": "NYSE", "type": "Equity"},
-            {
-                "symbol": "PG",
-                "name": "Procter & Gamble Co.",
-                "exchange": "NYSE",
-                "type": "Equity",
-            },
-            {
-                "symbol": "UNH",
-                "name": "UnitedHealth Group Inc.",
-                "exchange": "NYSE",
-                "type": "Equity",
-            },
-            {
-                "symbol": "HD",
-                "name": "Home Depot Inc.",
-                "exchange": "NYSE",
-                "type": "Equity",
-            },
-            {
-                "symbol": "MA",
-                "name": "Mastercard Inc.",
-                "exchange": "NYSE",
-                "type": "Equity",
-            },
-            {
-                "symbol": "NFLX",
-                "name": "Netflix Inc.",
-                "exchange": "NASDAQ",
-                "type": "Equity",
-            },
-            {
-                "symbol": "AMD",
-                "name": "Advanced Micro Devices Inc.",
-                "exchange": "NASDAQ",
-                "type": "Equity",
-            },
-            {
-                "symbol": "ADBE",
-                "name": "Adobe Inc.",
-                "exchange": "NASDAQ",
-                "type": "Equity",
-            },
-        ]
-        query_lower = query.lower()
-        return [
-            s
-            for s in common_stocks
-            if query_lower in s["symbol"].lower() or query_lower in s["name"].lower()
-        ]
+    async def search_tickers(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        if self._search_index is None:
+            self._search_index = TickerSearchIndex(
+                self._symbols.listings(), cache_size=settings.SEARCH_CACHE_SIZE
+            )
+        return self._search_index.search(query, limit)
+
+    def _listing(self, symbol: str) -> Optional[SymbolInfo]:
+        """
+        Registry lookup. Unknown symbols get their ticker.info fetched in the
+        background, which registers them for every later response. A lookup
+        that failed or found no name is not repeated until its miss expires.
+        """
+        listing = self._symbols.get(symbol)
+        if listing is None:
+            miss = self._cache.get(f"info_miss:{symbol}")
+            if miss is None or not miss.is_valid():
+                self._schedule_refresh(
+                    f"info:{symbol}", partial(self._lookup_listing, symbol)
+                )
+        return listing
 
-    def _fetch_history(self, symbol: str, period: str = "1mo") -> Any:
+    async def _lookup_listing(self, symbol: str) -> Dict[str, Any]:
+        miss_key = f"info_miss:{symbol}"
         try:
-            ticker = yf.Ticker(symbol)
-            return ticker.history(period=period, interval="1d", prepost=True)
-        except Exception as e:
-            print(f"Error fetching history for {symbol}: {e}")
-            return None
+            info = await self._load_info(symbol)
+        except Exception:
+            self._cache.set(miss_key, CacheEntry(True, settings.UPSTREAM_PARTIAL_TTL))
+            raise
+        if symbol not in self._symbols:
+            # Delisted or unknown to upstream
+            self._cache.set(
+                miss_key, CacheEntry(True, settings.SYMBOL_LOOKUP_RETRY_SECONDS)
+            )
+        return info
+
+    def _symbol_name(self, symbol: str) -> str:
+        listing = self._listing(symbol)
+        return listing.name if listing else symbol
+
+    async def _load_quotes(self, symbols: List[str]) -> Dict[str, Any]:
+        """
+        Quote dicts per symbol; symbols whose fetch failed map to the error.
+        Quotes computed from previous bars after a failed refresh are marked
+        stale as of when those bars were fetched.
+        """
+        histories, errors, fallbacks = await self._load_histories(symbols)
+        with span("compute"):
+            quotes = summarize_histories(histories)
+        for symbol, as_of in fallbacks.items():
+            if symbol in quotes:
+                quotes[symbol] = mark_stale(quotes[symbol], as_of)
+        return {**errors, **quotes}
+
+    async def _load_histories(
+        self, symbols: List[str]
+    ) -> Tuple[Dict[str, BarSeries], Dict[str, Exception], Dict[str, datetime]]:
+        """
+        Daily bars per symbol, updated incrementally. Known series (kept in
+        memory, else read from the on-disk store) only fetch the newest bars
+        from their second-to-last date and merge them in, and need no
+        upstream call at all if they were fetched after the last session
+        ended. Unknown symbols get a full 1mo download, and so do known ones
+        whose overlapping bars came back re-adjusted (split or dividend).
+        Also returns the fetch error for each symbol left without bars, and
+        when the bars were fetched for each symbol whose refresh failed and
+        which fell back to its previous bars.
+        """
+        known: Dict[str, StoredHistory] = {}
+        for symbol in symbols:
+            entry = self._bars.get(f"bars:{symbol}")
+            if entry is not None:
+                known[symbol] = entry.data
+
+        unknown = [s for s in symbols if s not in known]
+        if unknown and self._history_store is not None:
+            loop = asyncio.get_running_loop()
+            known.update(
+                await loop.run_in_executor(None, self._history_store.load_many, unknown)
+            )
 
-    async def get_stock_data(self, symbol: str) -> Optional[Dict[str, Any]]:
-        cache_key = f"stock:{symbol}"
-        cached = self._get_cached(cache_key)
+        settled_at = self._last_session_end()
+        missing = []
+        tail_start = {}
+        for symbol in symbols:
+            entry = known.get(symbol)
+            if entry is None:
+                missing.append(symbol)
+            elif settled_at is None or entry.fetched_at < settled_at:
+                # One settled bar of overlap to check the price basis against
+                tail_start[symbol] = entry.bars.dates[-min(2, len(entry.bars))]
+
+        fetches = {}
+        if missing:
+            fetches.update(self._history_calls(missing))
+        if tail_start:
+            start = str(min(tail_start.values()))
+            fetches.update(self._history_calls(list(tail_start), start=start))
+        fetched, errors = await self._gather_histories(fetches)
+
+        rebased = [
+            symbol
+            for symbol in tail_start
+            if symbol in fetched and not known[symbol].bars.same_basis(fetched[symbol])
+        ]
+        if rebased:
+            full, _ = await self._gather_histories(self._history_calls(rebased))
+            for symbol in rebased:
+                # Without a full refetch, keep the old bars rather than mix bases
+                fetched.pop(symbol)
+                if symbol in full:
+                    del known[symbol]
+                    fetched[symbol] = full[symbol]
+
+        if fetched and self._history_store is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None,
+                partial(self._history_store.save_many, fetched, replace=rebased),
+            )
+
+        now = datetime.now(timezone.utc)
+        histories = {}
+        fallbacks: Dict[str, datetime] = {}
+        with span("compute"):
+            for symbol in symbols:
+                entry = known.get(symbol)
+                if symbol in fetched:
+                    bars = (
+                        entry.bars.merge(fetched[symbol]) if entry else fetched[symbol]
+                    )
+                    entry = StoredHistory(bars.tail(settings.HISTORY_DAYS), now)
+                elif entry is None:
+                    continue
+                elif symbol in tail_start:
+                    # On upstream failure the previous bars beat returning nothing
+                    fallbacks[symbol] = entry.fetched_at
+                self._bars.set(
+                    f"bars:{symbol}", CacheEntry(entry, settings.CACHE_CLOSED_MAX_TTL)
+                )
+                histories[symbol] = entry.bars
+        errors = {s: e for s, e in errors.items() if s not in histories}
+        return histories, errors, fallbacks
+
+    def _history_calls(
+        self, symbols: List[str], **kwargs: Any
+    ) -> Dict[Tuple[str, ...], Awaitable[Dict[str, BarSeries]]]:
+        """
+        One upstream call per history_batch_size symbols, so each upstream
+        request is paced by the rate limiter and the concurrency cap
+        """
+        size = self._provider.history_batch_size or len(symbols)
+        return {
+            tuple(batch): self._upstream.run(
+                partial(self._provider.history, list(batch), **kwargs)
+            )
+            for batch in (symbols[i : i + size] for i in range(0, len(symbols), size))
+        }
+
+    async def _gather_histories(
+        self, calls: Dict[Tuple[str, ...], Awaitable[Dict[str, BarSeries]]]
+    ) -> Tuple[Dict[str, BarSeries], Dict[str, Exception]]:
+        """Bars from the calls that succeeded, and each failed symbol's error"""
+        fetched: Dict[str, BarSeries] = {}
+        errors: Dict[str, Exception] = {}
+        results = await asyncio.gather(*calls.values(), return_exceptions=True)
+        for batch, result in zip(calls, results):
+            if isinstance(result, Exception):
+                print(f"Error fetching history for {list(batch)}: {result}")
+                errors.update(dict.fromkeys(batch, result))
+                continue
+            fetched.update(result)
+        return fetched, errors
+
+    async def _fan_out(
+        self,
+        symbols: List[str],
+        fetch: Callable[[str], Awaitable[Any]],
+        label: str,
+    ) -> Tuple[List[Any], int]:
+        """
+        Run `fetch` for every symbol concurrently, each under its own timeout.
+        Returns the non-None results in symbol order plus the number of
+        symbols that timed out or failed and were dropped.
+        """
+
+        async def fetch_one(symbol: str) -> Tuple[Any, bool]:
+            try:
+                result = await asyncio.wait_for(
+                    fetch(symbol), timeout=settings.UPSTREAM_SYMBOL_TIMEOUT
+                )
+                return result, False
+            except asyncio.TimeoutError:
+                print(f"Timed out fetching {label} for {symbol}")
+            except Exception as e:
+                print(f"Error fetching {label} for {symbol}: {e}")
+            return None, True
+
+        outcomes = await asyncio.gather(*[fetch_one(s) for s in symbols])
+        results = [result for result, _ in outcomes if result is not None]
+        dropped = sum(1 for _, failed in outcomes if failed)
+        return results, dropped
+
+    def _partial_ttl(self, dropped: int) -> Optional[int]:
+        # Partial results are kept briefly so dropped symbols get retried soon
+        return settings.UPSTREAM_PARTIAL_TTL if dropped else None
+
+    def _set_built(self, key: str, data: Any, complete: bool):
+        """
+        Cache a result built from quotes or other cached sections. With a
+        stale or missing part it is kept for UPSTREAM_PARTIAL_TTL only and
+        never replaces the last good value, whose as_of would then hide how
+        old that part is.
+        """
+        self._set_cached(
+            key,
+            data,
+            None if complete else settings.UPSTREAM_PARTIAL_TTL,
+            complete=complete,
+        )
+
+    async def get_info(self, symbol: str) -> Dict[str, Any]:
+        """
+        Shared ticker.info store: one upstream fetch per symbol serves
+        ratings, dividend yield and 52-week range alike
+        """
+        cache_key = f"info:{symbol}"
+        loader = partial(self._load_info, symbol)
+        cached = self._get_cached(cache_key, loader)
         if cached:
             return cached
 
-        try:
-            hist = await asyncio.get_event_loop().run_in_executor(
-                None, self._fetch_history, symbol
-            )
+        return await self._load_once(cache_key, loader)
+
+    async def _load_info(self, symbol: str) -> Dict[str, Any]:
+        info = await self._upstream.run(self._provider.info, symbol)
+        info = {field: info.get(field) for field in self.INFO_FIELDS}
+        if any(value is not None for value in info.values()):
+            self._set_cached(f"info:{symbol}", info)
+            if symbol not in self._symbols:
+                listing = self._symbols.enrich(symbol, info)
+                if listing is not None and self._search_index is not None:
+                    self._search_index.add(listing._asdict())
+                self._flush_in_background(
+                    "symbols", self._symbols.flush, lambda: self._symbols.dirty
+                )
+        return info
 
-            if hist is None or hist.empty or len(hist) == 0:
-                return None
+    async def warm_info(
+        self, symbols: Optional[List[str]] = None, force: bool = False
+    ) -> int:
+        """Prefetch info for TOP_SYMBOLS and the dividend universe in one fan-out"""
+        if symbols is None:
+            symbols = list(dict.fromkeys(self.TOP_SYMBOLS + self.DIVIDEND_SYMBOLS))
 
-            closing_prices = hist["Close"].tolist()
-            sparkline = (
-                closing_prices[-7:] if len(closing_prices) >= 7 else closing_prices
+        async def reload(symbol: str) -> Dict[str, Any]:
+            return await self._load_once(
+                f"info:{symbol}", partial(self._load_info, symbol)
             )
 
-            current_price = hist["Close"].iloc[-1]
-            prev_close = hist["Close"].iloc[-2] if len(hist) > 1 else current_price
-            change = current_price - prev_close
-            change_percent = (change / prev_close) * 100 if prev_close else 0
+        infos, _ = await self._fan_out(
+            symbols, reload if force else self.get_info, "info"
+        )
+        return len(infos)
+
+    async def refresh(self, section: str):
+        """
+        Reload one dataset regardless of cache freshness. Used by the
+        prefetcher to keep hot keys warm before they expire.
+        """
+        if section == "indices":
+            await asyncio.gather(
+                *[
+                    self._load_once(f"index:{s}", partial(self._load_index_data, s, n))
+                    for s, n in self.INDICES.items()
+                ]
+            )
+        elif section == "stocks":
+            await asyncio.gather(
+                *[
+                    self._load_once(f"stock:{s}", partial(self._load_stock_data, s))
+                    for s in self.TOP_SYMBOLS
+                ]
+            )
+        elif section == "info":
+            await self.warm_info(force=True)
+        else:
+            loaders = {
+                "market_snapshot": self._load_market_snapshot,
+                "sectors": self._load_sector_performance,
+                "news": self._load_news,
+                "featured_news": self._load_featured_news,
+                "ratings": partial(self._load_analyst_ratings, self.TOP_SYMBOLS[:6]),
+                "earnings": self._load_earnings,
+                "dividends": self._load_dividend_stocks,
+                "week_highs_lows": self._load_week_highs_lows,
+            }
+            await self._load_once(section, loaders[section])
 
+    async def get_stock_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+        cache_key = f"stock:{symbol}"
+        loader = partial(self._load_stock_data, symbol)
+        cached = self._get_cached(cache_key, loader)
+        if cached:
+            return cached
+
+        return await self._load_once(cache_key, loader)
+
+    async def _load_stock_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+        cache_key = f"stock:{symbol}"
+        try:
+            quote = await self._quote_loader.load(symbol)
+
+            if quote is None:
+                return self._serve_last_good(cache_key)
+
+            listing = self._listing(symbol)
             result = {
                 "symbol": symbol,
-                "name": self.STOCK_NAMES.get(symbol, symbol),
-                "price": round(float(current_price), 2),
-                "change": round(float(change), 2),
-                "change_percent": round(float(change_percent), 2),
+                "name": listing.name if listing else symbol,
+                "price": quote["price"],
+                "change": quote["change"],
+                "change_percent": quote["change_percent"],
                 "market_cap": None,
-                "sparkline": [round(float(p), 2) for p in sparkline],
-                "currency": "USD",
+                "sparkline": quote["sparkline"],
+                "currency": listing.currency if listing else "USD",
+                **{k: quote[k] for k in ("stale", "as_of") if k in quote},
             }
 
-            self._set_cached(cache_key, result, ttl_seconds=30)
+            self._set_built(cache_key, result, not quote.get("stale"))
             return result
 
         except Exception as e:
             print(f"Error fetching {symbol}: {e}")
-            return None
+            stale = self._serve_last_good(cache_key)
+            if stale is None:
+                raise
+            return stale
 
     async def get_stocks_batch(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        # Cache misses issued together are folded into one bulk history download
         tasks = [self.get_stock_data(symbol) for symbol in symbols]
-        results = await asyncio.gather(*tasks)
-        return [r for r in results if r is not None]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        stocks = [r for r in results if r is not None and not isinstance(r, Exception)]
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors and not stocks:
+            # Nothing to show: surface the outage rather than an empty list
+            raise next(
+                (e for e in errors if isinstance(e, CircuitOpenError)), errors[0]
+            )
+        return stocks
 
     async def get_stock_detail(self, symbol: str) -> Optional[Dict[str, Any]]:
         return await self.get_stock_data(symbol)
 
-    async def get_index_data(self, symbol: str, name: str) -> Dict[str, Any]:
+    async def get_index_data(self, symbol: str, name: str) -> Optional[Dict[str, Any]]:
         cache_key = f"index:{symbol}"
-        cached = self._get_cached(cache_key)
+        loader = partial(self._load_index_data, symbol, name)
+        cached = self._get_cached(cache_key, loader)
         if cached:
             return cached
 
+        return await self._load_once(cache_key, loader)
+
+    async def _load_index_data(
+        self, symbol: str, name: str
+    ) -> Optional[Dict[str, Any]]:
+        cache_key = f"index:{symbol}"
         try:
-            hist = await asyncio.get_event_loop().run_in_executor(
-                None, self._fetch_history, symbol
-            )
+            quote = await self._quote_loader.load(symbol)
 
-            if hist is None or hist.empty or len(hist) == 0:
-                return {
-                    "symbol": symbol,
-                    "name": name,
-                    "price": 0.0,
-                    "change_percent": 0.0,
-                }
-
-            current_price = hist["Close"].iloc[-1]
-            prev_price = hist["Close"].iloc[-2] if len(hist) > 1 else current_price
-            change_percent = (
-                ((current_price - prev_price) / prev_price) * 100 if prev_price else 0
-            )
+            if quote is None:
+                return self._serve_last_good(cache_key)
 
             result = {
                 "symbol": symbol,
                 "name": name,
-                "price": round(float(current_price), 2),
-                "change_percent": round(float(change_percent), 2),
+                "price": quote["price"],
+                "change_percent": quote["change_percent"],
+                **{k: quote[k] for k in ("stale", "as_of") if k in quote},
             }
 
-            self._set_cached(cache_key, result, ttl_seconds=30)
+            self._set_built(cache_key, result, not quote.get("stale"))
             return result
 
         except Exception as e:
             print(f"Error fetching index {symbol}: {e}")
-            return {"symbol": symbol, "name": name, "price": 0.0, "change_percent": 0.0}
+            stale = self._serve_last_good(cache_key)
+            if stale is None:
+                raise
+            return stale
 
     async def get_market_snapshot(self) -> Dict[str, Any]:
-        cached = self._get_cached("market_snapshot")
+        cached = self._get_cached("market_snapshot", self._load_market_snapshot)
         if cached:
             return cached
 
-        index_tasks = [self.get_index_data(s, n) for s, n in self.INDICES.items()]
-        indices = await asyncio.gather(*index_tasks)
+        return await self._load_once("market_snapshot", self._load_market_snapshot)
 
-        top_stocks = await self.get_stocks_batch(self.TOP_SYMBOLS[:10])
+    async def _load_market_snapshot(self) -> Dict[str, Any]:
+        index_tasks = [self.get_index_data(s, n) for s, n in self.INDICES.items()]
+        # Gathered together so index and stock misses share one history batch
+        indices, top_stocks = await asyncio.gather(
+            asyncio.gather(*index_tasks, return_exceptions=True),
+            self.get_stocks_batch(self.TOP_SYMBOLS[:10]),
+            return_exceptions=True,
+        )
+        indices = [index for index in indices if isinstance(index, dict)]
+        if isinstance(top_stocks, Exception):
+            top_stocks = []
+        if not indices and not top_stocks:
+            return self._serve_last_good(
+                "market_snapshot", {"indices": [], "top_movers": []}
+            )
         movers = sorted(
             top_stocks, key=lambda x: abs(x.get("change_percent", 0)), reverse=True
         )[:5]
@@ -330,40 +861,90 @@ class MarketDataService:
                 "name": s["name"],
                 "price": s["price"],
                 "change_percent": s["change_percent"],
+                **{k: s[k] for k in ("stale", "as_of") if k in s},
             }
             for s in movers
         ]
 
-        result = {"indices": list(indices), "top_movers": formatted_movers}
-        self._set_cached("market_snapshot", result, ttl_seconds=30)
+        result = {
+            "indices": indices,
+            "top_movers": formatted_movers,
+        }
+        complete = (
+            len(indices) == len(self.INDICES)
+            and len(top_stocks) == len(self.TOP_SYMBOLS[:10])
+            and not any(item.get("stale") for item in indices + top_stocks)
+        )
+        self._set_built("market_snapshot", result, complete)
         return result
 
+    def market_session(self, now: Optional[datetime] = None) -> str:
+        """NYSE session state: pre, regular, post or closed"""
+        now = now or datetime.now(NYSE_TZ)
+        if now.weekday() >= 5:
+            return "closed"
+        current_time = now.time()
+        if MARKET_OPEN <= current_time < MARKET_CLOSE:
+            return "regular"
+        if PRE_MARKET_OPEN <= current_time < MARKET_OPEN:
+            return "pre"
+        if MARKET_CLOSE <= current_time < POST_MARKET_CLOSE:
+            return "post"
+        return "closed"
+
+    def _seconds_until_next_session(self, now: datetime) -> int:
+        day = now.date()
+        if now.weekday() >= 5 or now.time() >= PRE_MARKET_OPEN:
+            day += timedelta(days=1)
+            while day.weekday() >= 5:
+                day += timedelta(days=1)
+        next_open = NYSE_TZ.localize(datetime.combine(day, PRE_MARKET_OPEN))
+        return int((next_open - now).total_seconds())
+
+    def _last_session_end(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """End of the most recent session while closed, None while trading"""
+        now = now or datetime.now(NYSE_TZ)
+        if self.market_session(now) != "closed":
+            return None
+        day = now.date()
+        if now.weekday() >= 5 or now.time() < PRE_MARKET_OPEN:
+            day -= timedelta(days=1)
+            while day.weekday() >= 5:
+                day -= timedelta(days=1)
+        return NYSE_TZ.localize(datetime.combine(day, POST_MARKET_CLOSE))
+
     async def get_market_status(self) -> Dict[str, Any]:
-        nyse = pytz.timezone("America/New_York")
-        now = datetime.now(nyse)
+        """
+        Session state with a minute-resolution countdown. The same dict is
+        returned until the next minute starts, so /api/dashboard's response
+        cache can still recognise its sections as unchanged.
+        """
+        entry = self._cache.get("status")
+        if entry is not None and entry.is_valid():
+            return entry.data
+
+        now = datetime.now(NYSE_TZ)
 
         is_weekday = now.weekday() < 5
-        market_open = time(9, 30)
-        market_close = time(16, 0)
         current_time = now.time()
 
-        is_open = is_weekday and market_open <= current_time < market_close
+        is_open = self.market_session(now) == "regular"
 
         countdown = ""
         if is_open:
-            close_dt = nyse.localize(datetime(now.year, now.month, now.day, 16, 0))
+            close_dt = NYSE_TZ.localize(datetime(now.year, now.month, now.day, 16, 0))
             diff = close_dt - now
             hours = int(diff.total_seconds() // 3600)
             minutes = int((diff.total_seconds() % 3600) // 60)
             countdown = f"{hours}h {minutes}m"
-        elif is_weekday and current_time < market_open:
-            open_dt = nyse.localize(datetime(now.year, now.month, now.day, 9, 30))
+        elif is_weekday and current_time < MARKET_OPEN:
+            open_dt = NYSE_TZ.localize(datetime(now.year, now.month, now.day, 9, 30))
             diff = open_dt - now
             hours = int(diff.total_seconds() // 3600)
             minutes = int((diff.total_seconds() % 3600) // 60)
             countdown = f"{hours}h {minutes}m"
 
-        return {
+        status = {
             "isOpen": is_open,
             "exchange": "NYSE",
             "nextEvent": "close" if is_open else "open",
@@ -371,70 +952,91 @@ class MarketDataService:
             "openTime": "9:30 AM ET",
             "closeTime": "4:00 PM ET",
         }
+        ttl = 60 - now.second - now.microsecond / 1_000_000
+        self._cache.set("status", CacheEntry(status, ttl))
+        return status
 
     async def get_sector_performance(self) -> List[Dict[str, Any]]:
-        cached = self._get_cached("sectors")
+        cached = self._get_cached("sectors", self._load_sector_performance)
         if cached:
             return cached
 
+        return await self._load_once("sectors", self._load_sector_performance)
+
+    async def _load_sector_performance(self) -> List[Dict[str, Any]]:
         async def get_sector_change(
             sector_name: str, etf_symbol: str
-        ) -> Dict[str, Any]:
+        ) -> Optional[Dict[str, Any]]:
             try:
-                hist = await asyncio.get_event_loop().run_in_executor(
-                    None, self._fetch_history, etf_symbol
-                )
-                if hist is not None and len(hist) >= 2:
-                    current = hist["Close"].iloc[-1]
-                    prev = hist["Close"].iloc[-2]
-                    change_percent = ((current - prev) / prev) * 100
-                else:
-                    change_percent = 0.0
-                return {
-                    "name": sector_name,
-                    "change_percent": round(float(change_percent), 2),
-                }
+                quote = await self._quote_loader.load(etf_symbol)
             except Exception as e:
                 print(f"Error fetching sector {sector_name}: {e}")
-                return {"name": sector_name, "change_percent": 0.0}
+                return None
+            if quote is None:
+                return None
+            return {
+                "name": sector_name,
+                "change_percent": quote["change_percent"],
+                **{k: quote[k] for k in ("stale", "as_of") if k in quote},
+            }
 
         tasks = [get_sector_change(n, s) for n, s in self.SECTOR_ETFS.items()]
-        results = await asyncio.gather(*tasks)
-        self._set_cached("sectors", list(results), ttl_seconds=60)
-        return list(results)
+        results = list(await asyncio.gather(*tasks))
+        if all(result is not None and not result.get("stale") for result in results):
+            self._set_cached("sectors", results)
+            return results
+        if not any(results):
+            return self._serve_last_good("sectors", [])
+
+        # Fill failed sectors from their last good values, marked stale
+        previous = {item["name"]: item for item in self._stale_value("sectors") or []}
+        merged = [
+            result if result is not None else previous.get(name)
+            for result, name in zip(results, self.SECTOR_ETFS)
+        ]
+        merged = [item for item in merged if item is not None]
+        self._cache.set("sectors", CacheEntry(merged, settings.UPSTREAM_PARTIAL_TTL))
+        return merged
 
     async def get_news(self, limit: int = 6) -> List[Dict[str, Any]]:
-        cached = self._get_cached("news")
+        cached = self._get_cached("news", self._load_news)
         if cached:
             return cached[:limit]
 
-        all_news = []
-        for symbol in self.NEWS_SYMBOLS[:3]:
-            try:
-                ticker = yf.Ticker(symbol)
-                news_items = ticker.news or []
-                for item in news_items[:2]:
-                    pub_time = item.get("providerPublishTime", 0)
-                    published_at = (
-                        datetime.utcfromtimestamp(pub_time).isoformat() + "Z"
-                        if pub_time
-                        else ""
-                    )
-                    all_news.append(
-                        {
-                            "title": item.get("title", ""),
-                            "publisher": item.get("publisher", ""),
-                            "link": item.get("link", ""),
-                            "published_at": published_at,
-                            "related_stocks": [symbol],
-                        }
-                    )
-            except Exception as e:
-                print(f"Error fetching news for {symbol}: {e}")
+        all_news = await self._load_once("news", self._load_news)
+        return all_news[:limit]
 
+    async def _load_news(self) -> List[Dict[str, Any]]:
+        async def fetch(symbol: str) -> List[Dict[str, Any]]:
+            news_items = await self._upstream.run(self._provider.news, symbol)
+            items = []
+            for item in news_items[:2]:
+                pub_time = item.get("providerPublishTime", 0)
+                published_at = (
+                    datetime.utcfromtimestamp(pub_time).isoformat() + "Z"
+                    if pub_time
+                    else ""
+                )
+                items.append(
+                    {
+                        "title": item.get("title", ""),
+                        "publisher": item.get("publisher", ""),
+                        "link": item.get("link", ""),
+                        "published_at": published_at,
+                        "related_stocks": [symbol],
+                    }
+                )
+            return items
+
+        per_symbol, dropped = await self._fan_out(self.NEWS_SYMBOLS[:3], fetch, "news")
+        if not per_symbol and dropped:
+            return self._serve_last_good("news", [])
+        all_news = [item for items in per_symbol for item in items]
         all_news.sort(key=lambda x: x.get("published_at", ""), reverse=True)
-        self._set_cached("news", all_news, ttl_seconds=300)
-        return all_news[:limit]
+        self._set_cached(
+            "news", all_news, self._partial_ttl(dropped), complete=not dropped
+        )
+        return all_news
 
     async def get_analyst_ratings(
         self, symbols: List[str] = None, limit: int = 6
@@ -442,274 +1044,294 @@ class MarketDataService:
         if symbols is None:
             symbols = self.TOP_SYMBOLS[:6]
 
-        cached = self._get_cached("ratings")
+        loader = partial(self._load_analyst_ratings, symbols)
+        cached = self._get_cached("ratings", loader)
         if cached:
             return cached[:limit]
 
-        results = []
-        for symbol in symbols[:limit]:
-            try:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
-
-                rec_key = info.get("recommendationKey", "hold")
-                rating_map = {
-                    "strong_buy": "buy",
-                    "buy": "buy",
-                    "hold": "hold",
-                    "sell": "sell",
-                    "strong_sell": "sell",
-                }
-                rating = rating_map.get(rec_key, "hold")
-
-                score_map = {"buy": 4.5, "hold": 3.0, "sell": 2.0}
-                rating_score = score_map.get(rating, 3.0)
-
-                target_price = (
-                    info.get("targetMedianPrice") or info.get("targetMeanPrice") or 0
-                )
-                current_price = (
-                    info.get("currentPrice") or info.get("regularMarketPrice") or 0
-                )
+        results = await self._load_once("ratings", loader)
+        return results[:limit]
 
-                upside = 0.0
-                if target_price > 0 and current_price > 0:
-                    upside = ((target_price - current_price) / current_price) * 100
+    async def _load_analyst_ratings(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        async def fetch(symbol: str) -> Dict[str, Any]:
+            info = await self.get_info(symbol)
+
+            rec_key = info.get("recommendationKey", "hold")
+            rating_map = {
+                "strong_buy": "buy",
+                "buy": "buy",
+                "hold": "hold",
+                "sell": "sell",
+                "strong_sell": "sell",
+            }
+            rating = rating_map.get(rec_key, "hold")
 
-                results.append(
-                    {
-                        "symbol": symbol,
-                        "name": self.STOCK_NAMES.get(symbol, symbol),
-                        "rating": rating,
-                        "rating_score": rating_score,
-                        "target_price": round(float(target_price), 2),
-                        "current_price": round(float(current_price), 2),
-                        "upside_percent": round(float(upside), 2),
-                        "analyst_count": info.get("numberOfAnalystOpinions") or 0,
-                    }
-                )
-            except Exception as e:
-                print(f"Error fetching ratings for {symbol}: {e}")
+            score_map = {"buy": 4.5, "hold": 3.0, "sell": 2.0}
+            rating_score = score_map.get(rating, 3.0)
+
+            target_price = (
+                info.get("targetMedianPrice") or info.get("targetMeanPrice") or 0
+            )
+            current_price = (
+                info.get("currentPrice") or info.get("regularMarketPrice") or 0
+            )
+
+            upside = 0.0
+            if target_price > 0 and current_price > 0:
+                upside = ((target_price - current_price) / current_price) * 100
 
+            return {
+                "symbol": symbol,
+                "name": self._symbol_name(symbol),
+                "rating": rating,
+                "rating_score": rating_score,
+                "target_price": round(float(target_price), 2),
+                "current_price": round(float(current_price), 2),
+                "upside_percent": round(float(upside), 2),
+                "analyst_count": info.get("numberOfAnalystOpinions") or 0,
+            }
+
+        results, dropped = await self._fan_out(symbols, fetch, "ratings")
+        if not results and dropped:
+            return self._serve_last_good("ratings", [])
         results.sort(key=lambda x: x.get("rating_score", 0), reverse=True)
-        self._set_cached("ratings", results, ttl_seconds=300)
-        return results[:limit]
+        self._set_cached(
+            "ratings", results, self._partial_ttl(dropped), complete=not dropped
+        )
+        return results
 
     async def get_earnings(self, limit: int = 8) -> List[Dict[str, Any]]:
-        cached = self._get_cached("earnings")
+        cached = self._get_cached("earnings", self._load_earnings)
         if cached:
             return cached[:limit]
 
-        earnings = []
-        for symbol in self.TOP_SYMBOLS[:10]:
-            try:
-                ticker = yf.Ticker(symbol)
-                earnings_dates = ticker.earnings_dates
+        earnings = await self._load_once("earnings", self._load_earnings)
+        return earnings[:limit]
 
-                if earnings_dates is None or earnings_dates.empty:
-                    continue
+    async def _load_earnings(self) -> List[Dict[str, Any]]:
+        async def fetch(symbol: str) -> Optional[Dict[str, Any]]:
+            earnings_dates = await self._upstream.run(
+                self._provider.earnings_dates, symbol
+            )
 
-                now = datetime.now()
-                upcoming = earnings_dates[earnings_dates.index > now]
-
-                if not upcoming.empty:
-                    next_earning = upcoming.iloc[0]
-                    earnings_date = upcoming.index[0]
-
-                    earnings.append(
-                        {
-                            "symbol": symbol,
-                            "name": self.STOCK_NAMES.get(symbol, symbol),
-                            "date": earnings_date.strftime("%b %d"),
-                            "time": "after_market",
-                            "expected_eps": next_earning.get("EPS Estimate") or None,
-                        }
-                    )
-            except Exception as e:
-                print(f"Error fetching earnings for {symbol}: {e}")
+            now = datetime.now(timezone.utc)
+            upcoming = [(d, eps) for d, eps in earnings_dates if d > now]
+            if not upcoming:
+                return None
 
-        self._set_cached("earnings", earnings, ttl_seconds=3600)
-        return earnings[:limit]
+            earnings_date, expected_eps = upcoming[0]
+            return {
+                "symbol": symbol,
+                "name": self._symbol_name(symbol),
+                "date": earnings_date.strftime("%b %d"),
+                "time": "after_market",
+                "expected_eps": expected_eps or None,
+            }
+
+        earnings, dropped = await self._fan_out(
+            self.TOP_SYMBOLS[:10], fetch, "earnings"
+        )
+        if not earnings and dropped:
+            return self._serve_last_good("earnings", [])
+        self._set_cached(
+            "earnings", earnings, self._partial_ttl(dropped), complete=not dropped
+        )
+        return earnings
 
     async def get_dividend_stocks(self, limit: int = 6) -> List[Dict[str, Any]]:
-        cached = self._get_cached("dividends")
+        cached = self._get_cached("dividends", self._load_dividend_stocks)
         if cached:
             return cached[:limit]
 
-        results = []
-        dividend_symbols = [
-            "XOM",
-            "CVX",
-            "KO",
-            "JNJ",
-            "PG",
-            "PFE",
-            "VZ",
-            "T",
-            "IBM",
-            "MO",
-        ]
+        results = await self._load_once("dividends", self._load_dividend_stocks)
+        return results[:limit]
 
-        for symbol in dividend_symbols:
-            try:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
+    async def _load_dividend_stocks(self) -> List[Dict[str, Any]]:
+        async def fetch(symbol: str) -> Optional[Dict[str, Any]]:
+            info = await self.get_info(symbol)
 
-                dividend_yield = info.get("dividendYield")
-                if not dividend_yield or dividend_yield == 0:
-                    continue
+            dividend_yield = info.get("dividendYield")
+            if not dividend_yield or dividend_yield == 0:
+                return None
 
-                dividend_rate = info.get("dividendRate") or 0
-                current_price = (
-                    info.get("currentPrice") or info.get("regularMarketPrice") or 0
-                )
+            dividend_rate = info.get("dividendRate") or 0
+            current_price = (
+                info.get("currentPrice") or info.get("regularMarketPrice") or 0
+            )
 
-                ex_dividend_date = ""
-                ex_date = info.get("exDividendDate")
-                if ex_date:
-                    try:
-                        ex_dividend_date = datetime.fromtimestamp(ex_date).strftime(
-                            "%b %d"
-                        )
-                    except:
-                        pass
-
-                yield_pct = (
-                    dividend_yield * 100 if dividend_yield < 1 else dividend_yield
-                )
+            ex_dividend_date = ""
+            ex_date = info.get("exDividendDate")
+            if ex_date:
+                try:
+                    ex_dividend_date = datetime.fromtimestamp(ex_date).strftime("%b %d")
+                except:
+                    pass
 
-                results.append(
-                    {
-                        "symbol": symbol,
-                        "name": self.STOCK_NAMES.get(
-                            symbol, info.get("shortName", symbol)
-                        ),
-                        "price": round(float(current_price), 2),
-                        "dividend_yield": round(float(yield_pct), 2),
-                        "annual_dividend": round(float(dividend_rate), 2),
-                        "payout_frequency": "quarterly",
-                        "ex_dividend_date": ex_dividend_date,
-                    }
-                )
-            except Exception as e:
-                print(f"Error fetching dividend for {symbol}: {e}")
+            yield_pct = dividend_yield * 100 if dividend_yield < 1 else dividend_yield
+
+            return {
+                "symbol": symbol,
+                "name": self._symbol_name(symbol),
+                "price": round(float(current_price), 2),
+                "dividend_yield": round(float(yield_pct), 2),
+                "annual_dividend": round(float(dividend_rate), 2),
+                "payout_frequency": "quarterly",
+                "ex_dividend_date": ex_dividend_date,
+            }
 
+        results, dropped = await self._fan_out(self.DIVIDEND_SYMBOLS, fetch, "dividend")
+        if not results and dropped:
+            return self._serve_last_good("dividends", [])
         results.sort(key=lambda x: x.get("dividend_yield", 0), reverse=True)
-        self._set_cached("dividends", results, ttl_seconds=3600)
-        return results[:limit]
+        self._set_cached(
+            "dividends", results, self._partial_ttl(dropped), complete=not dropped
+        )
+        return results
 
     async def get_featured_news(self) -> Dict[str, Any]:
-        cached = self._get_cached("featured_news")
+        cached = self._get_cached("featured_news", self._load_featured_news)
         if cached:
             return cached
 
-        news = await self.get_news(limit=3)
+        return await self._load_once("featured_news", self._load_featured_news)
+
+    async def _load_featured_news(self) -> Dict[str, Any]:
+        try:
+            news = await self.get_news(limit=3)
+        except CircuitOpenError:
+            news = []
 
         if news and len(news) > 0 and news[0].get("title"):
             featured = {
                 "title": news[0].get("title", ""),
-                "symbol": news[0].get("related_stocks", [""])[0]
-                if news[0].get("related_stocks")
-                else "",
+                "symbol": (
+                    news[0].get("related_stocks", [""])[0]
+                    if news[0].get("related_stocks")
+                    else ""
+                ),
                 "summary": news[0].get("title", ""),
+                **{k: news[0][k] for k in ("stale", "as_of") if k in news[0]},
             }
+        elif (
+            self._last_good.get("featured_news") is not None
+            or self._upstream.breaker.is_open
+        ):
+            return self._serve_last_good("featured_news")
         else:
+            # Placeholder for a cold start with no news ever loaded
             featured = {
                 "title": "Markets Rally as Tech Leads Gains",
                 "symbol": "NVDA",
                 "summary": "Strong performance in technology sector drives market gains.",
             }
 
-        self._set_cached("featured_news", featured, ttl_seconds=300)
+        # The cold-start placeholder counts as missing, too
+        complete = bool(news) and not featured.get("stale")
+        self._set_built("featured_news", featured, complete)
         return featured
 
     async def get_week_highs_lows(self) -> Dict[str, List[Dict[str, Any]]]:
-        cached = self._get_cached("week_highs_lows")
+        cached = self._get_cached("week_highs_lows", self._load_week_highs_lows)
         if cached:
             return cached
 
-        highs = []
-        lows = []
+        return await self._load_once("week_highs_lows", self._load_week_highs_lows)
 
-        for symbol in self.TOP_SYMBOLS[:15]:
-            try:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
+    async def _load_week_highs_lows(self) -> Dict[str, List[Dict[str, Any]]]:
+        async def fetch(symbol: str) -> Optional[Dict[str, Any]]:
+            info = await self.get_info(symbol)
 
-                current_price = (
-                    info.get("currentPrice") or info.get("regularMarketPrice") or 0
-                )
-                week_high = info.get("fiftyTwoWeekHigh") or 0
-                week_low = info.get("fiftyTwoWeekLow") or 0
+            current_price = (
+                info.get("currentPrice") or info.get("regularMarketPrice") or 0
+            )
+            week_high = info.get("fiftyTwoWeekHigh") or 0
+            week_low = info.get("fiftyTwoWeekLow") or 0
 
-                if current_price == 0 or week_high == 0:
-                    continue
+            if current_price == 0 or week_high == 0:
+                return None
 
-                percent_from_high = (
-                    ((week_high - current_price) / week_high) * 100 if week_high else 0
-                )
-                is_new_high = (
-                    abs(current_price - week_high) / week_high < 0.01
-                    if week_high
-                    else False
-                )
-                is_new_low = (
-                    abs(current_price - week_low) / week_low < 0.01
-                    if week_low and week_low > 0
-                    else False
-                )
+            percent_from_high = (
+                ((week_high - current_price) / week_high) * 100 if week_high else 0
+            )
+            is_new_high = (
+                abs(current_price - week_high) / week_high < 0.01
+                if week_high
+                else False
+            )
+            is_new_low = (
+                abs(current_price - week_low) / week_low < 0.01
+                if week_low and week_low > 0
+                else False
+            )
 
-                item = {
-                    "symbol": symbol,
-                    "name": self.STOCK_NAMES.get(symbol, info.get("shortName", symbol)),
-                    "price": round(float(current_price), 2),
-                    "week_high": round(float(week_high), 2),
-                    "week_low": round(float(week_low), 2),
-                    "percent_from_high": round(float(percent_from_high), 2),
-                    "is_new_high": is_new_high,
-                    "is_new_low": is_new_low,
-                }
-
-                if is_new_high:
-                    highs.append(item)
-                elif is_new_low:
-                    lows.append(item)
-            except Exception as e:
-                print(f"Error fetching week high/low for {symbol}: {e}")
+            return {
+                "symbol": symbol,
+                "name": self._symbol_name(symbol),
+                "price": round(float(current_price), 2),
+                "week_high": round(float(week_high), 2),
+                "week_low": round(float(week_low), 2),
+                "percent_from_high": round(float(percent_from_high), 2),
+                "is_new_high": is_new_high,
+                "is_new_low": is_new_low,
+            }
 
-        if not highs and not lows:
-            stocks = await self.get_stocks_batch(self.TOP_SYMBOLS[:10])
-            sorted_stocks = sorted(
-                stocks, key=lambda x: x.get("change_percent", 0), reverse=True
-            )
+        items, dropped = await self._fan_out(
+            self.TOP_SYMBOLS[:15], fetch, "week high/low"
+        )
+        if not items:
+            return self._serve_last_good("week_highs_lows", {"highs": [], "lows": []})
+        highs = [item for item in items if item["is_new_high"]]
+        lows = [
+            item for item in items if item["is_new_low"] and not item["is_new_high"]
+        ]
 
-            for stock in sorted_stocks[:3]:
-                highs.append(
-                    {
-                        "symbol": stock["symbol"],
-                        "name": stock["name"],
-                        "price": stock["price"],
-                        "week_high": round(stock["price"] * 1.05, 2),
-                        "week_low": round(stock["price"] * 0.8, 2),
-                        "percent_from_high": 5.0,
-                        "is_new_high": False,
-                        "is_new_low": False,
-                    }
-                )
-            for stock in sorted_stocks[-2:]:
-                lows.append(
-                    {
-                        "symbol": stock["symbol"],
-                        "name": stock["name"],
-                        "price": stock["price"],
-                        "week_high": round(stock["price"] * 1.2, 2),
-                        "week_low": round(stock["price"] * 0.95, 2),
-                        "percent_from_high": 20.0,
-                        "is_new_high": False,
-                        "is_new_low": False,
-                    }
-                )
+        if not highs and not lows:
+            # No new extremes today: show the stocks nearest to them instead
+            highs = sorted(items, key=lambda x: x["percent_from_high"])[:3]
+            lows = sorted(
+                (item for item in items if item["week_low"] > 0),
+                key=lambda x: x["price"] / x["week_low"],
+            )[:3]
 
         result = {"highs": highs[:3], "lows": lows[:3]}
-        self._set_cached("week_highs_lows", result, ttl_seconds=3600)
+        self._set_cached(
+            "week_highs_lows", result, self._partial_ttl(dropped), complete=not dropped
+        )
         return result
+
+    async def get_dashboard(
+        self, sections: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Run the homepage getters concurrently. A section that fails or exceeds
+        DASHBOARD_SECTION_TIMEOUT is returned as None and listed in the errors;
+        its load keeps running in the background and lands in the cache.
+        """
+        getters = {
+            "market_snapshot": self.get_market_snapshot,
+            "status": self.get_market_status,
+            "sectors": self.get_sector_performance,
+            "news": self.get_news,
+            "featured_news": self.get_featured_news,
+            "ratings": self.get_analyst_ratings,
+            "earnings": self.get_earnings,
+            "dividends": self.get_dividend_stocks,
+            "week_highs_lows": self.get_week_highs_lows,
+        }
+        sections = sections or self.DASHBOARD_SECTIONS
+
+        async def run(section: str) -> Any:
+            try:
+                return await asyncio.wait_for(
+                    getters[section](), settings.DASHBOARD_SECTION_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                print(f"Timed out fetching dashboard section {section}")
+            except Exception as e:
+                print(f"Error fetching dashboard section {section}: {e}")
+            return None
+
+        results = await asyncio.gather(*[run(section) for section in sections])
+        payload = dict(zip(sections, results))
+        errors = [section for section, result in payload.items() if result is None]
+        return payload, errors
@@ -0,0 +1,113 @@
+"""
+Market Data Prefetcher - keeps hot cache keys warm in the background
+Started and stopped from the FastAPI lifespan
+"""
+
+import asyncio
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.market_data import MarketDataService
+
+# Sections built from other sections' cached data, refreshed after them
+DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "market_snapshot": ("indices", "stocks"),
+    "featured_news": ("news",),
+    "ratings": ("info",),
+    "dividends": ("info",),
+    "week_highs_lows": ("info",),
+}
+
+
+class MarketDataPrefetcher:
+    """
+    Pre-warms every dataset at startup, then refreshes each one on its own
+    cadence. Intervals come from Settings.PREFETCH_INTERVALS and switch
+    between the open and closed value based on the NYSE session, with
+    pre/post-market counted as open.
+
+    Each section runs as its own task, so a slow one never holds back the
+    next tick of the others. A section whose inputs are refreshing at the
+    same time waits for them first and is built from their new values.
+    """
+
+    def __init__(self, service: MarketDataService):
+        self.service = service
+        self.intervals = settings.PREFETCH_INTERVALS
+        self.tick_seconds = settings.PREFETCH_TICK_SECONDS
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._last_run: Dict[str, float] = {}
+        self._runs: Dict[str, int] = {section: 0 for section in self.intervals}
+        self._failures: Dict[str, int] = {section: 0 for section in self.intervals}
+        self._session = "closed"
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        tasks = [self._task, *self._inflight.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._inflight.clear()
+
+    async def _run(self):
+        self._schedule(list(self.intervals))
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            self._session = self.service.market_session()
+            self._schedule(self._due_sections(monotonic()))
+
+    def _due_sections(self, now: float) -> List[str]:
+        due = []
+        for section, (when_open, when_closed) in self.intervals.items():
+            interval = when_closed if self._session == "closed" else when_open
+            if interval <= 0 or section in self._inflight:
+                continue
+            if now - self._last_run.get(section, 0.0) >= interval:
+                due.append(section)
+        return due
+
+    def _schedule(self, sections: List[str]):
+        # Inputs first, so dependents started in the same tick find them in flight
+        sections = sorted(sections, key=lambda section: section in DEPENDENCIES)
+        now = monotonic()
+        for section in sections:
+            self._last_run[section] = now
+            task = asyncio.create_task(self._refresh(section))
+            self._inflight[section] = task
+            task.add_done_callback(lambda _, section=section: self._done(section))
+
+    def _done(self, section: str):
+        self._inflight.pop(section, None)
+
+    async def _refresh(self, section: str):
+        inputs = [
+            self._inflight[name]
+            for name in DEPENDENCIES.get(section, ())
+            if name in self._inflight
+        ]
+        if inputs:
+            await asyncio.wait(inputs)
+        try:
+            await self.service.refresh(section)
+        except Exception as e:
+            self._failures[section] += 1
+            print(f"Error prefetching {section}: {e}")
+        finally:
+            self._runs[section] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "inflight": sorted(self._inflight),
+            "session": self._session,
+            "runs": dict(self._runs),
+            "failures": dict(self._failures),
+        }
@@ -0,0 +1,154 @@
+"""
+Market Data Providers - the upstream calls MarketDataService makes
+yfinance is the default; FakeProvider serves local data for load testing
+"""
+
+import math
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import yfinance as yf
+from yfinance.exceptions import YFTickerMissingError
+
+from app.core.config import settings
+from app.services.bars import BarSeries
+
+# Substrings of yfinance error messages that mean Yahoo is throttling or down,
+# not that a symbol has no data
+UPSTREAM_FAILURE_MARKERS = (
+    "Too Many Requests",
+    "Rate limit",
+    "429",
+    "CURRENTLY DOWN",
+    "Expecting value",
+)
+
+# (tz-aware date, EPS estimate or None), oldest first
+EarningsDate = Tuple[datetime, Optional[float]]
+
+
+class MarketDataProvider(ABC):
+    """
+    Blocking upstream calls, run on the service's upstream executor. Results
+    are plain Python / BarSeries values so nothing provider-specific leaks
+    into the caches. Upstream failures must raise so the breaker sees them.
+    """
+
+    name = "provider"
+
+    # Most symbols one history() call may cover (None = no limit). Each call
+    # costs one rate-limit token and one concurrency slot, so a provider
+    # that makes one request per symbol sets 1 and the service splits batches.
+    history_batch_size: Optional[int] = None
+
+    @abstractmethod
+    def history(
+        self, symbols: List[str], period: str = "1mo", start: Optional[str] = None
+    ) -> Dict[str, BarSeries]:
+        """Daily bars per symbol, for `period` or from `start` (YYYY-MM-DD)"""
+
+    @abstractmethod
+    def info(self, symbol: str) -> Dict[str, Any]:
+        """ticker.info-style fields (currentPrice, fiftyTwoWeekHigh, ...)"""
+
+    @abstractmethod
+    def news(self, symbol: str) -> List[Dict[str, Any]]:
+        """News items with title, publisher, link and providerPublishTime"""
+
+    @abstractmethod
+    def earnings_dates(self, symbol: str) -> List[EarningsDate]:
+        """Past and upcoming earnings dates"""
+
+    def close(self):
+        """Called once at shutdown"""
+
+
+class YFinanceProvider(MarketDataProvider):
+    name = "yfinance"
+
+    # One Yahoo request per symbol
+    history_batch_size = 1
+
+    def _history_bars(
+        self, symbol: str, period: str = "1mo", start: Optional[str] = None
+    ) -> Optional[BarSeries]:
+        """
+        One symbol's daily bars, or None when Yahoo has none for it (unknown
+        or delisted symbol, or no session in the range, e.g. a holiday
+        tail). Throttling and outages raise, so the circuit breaker counts
+        them; errors come from this call only, not yfinance's shared state.
+        """
+        span = {"start": start} if start else {"period": period}
+        try:
+            frame = yf.Ticker(symbol).history(
+                **span, interval="1d", prepost=True, raise_errors=True
+            )
+        except YFTickerMissingError as e:
+            if any(marker in str(e) for marker in UPSTREAM_FAILURE_MARKERS):
+                raise
+            return None
+        bars = BarSeries.from_frame(frame)
+        return bars if len(bars) else None
+
+    def history(
+        self, symbols: List[str], period: str = "1mo", start: Optional[str] = None
+    ) -> Dict[str, BarSeries]:
+        """
+        Daily history per symbol, converted to BarSeries so no DataFrame
+        outlives the fetch. The service calls this one symbol at a time (see
+        history_batch_size); for several, symbols that fail are left out and
+        the call raises only if none succeeded.
+        """
+        histories = {}
+        errors = []
+        for symbol in symbols:
+            try:
+                bars = self._history_bars(symbol, period, start)
+            except Exception as e:
+                print(f"Error fetching history for {symbol}: {e}")
+                errors.append(e)
+                continue
+            if bars is not None:
+                histories[symbol] = bars
+        if errors and not histories:
+            raise errors[0]
+        return histories
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        return yf.Ticker(symbol).info or {}
+
+    def news(self, symbol: str) -> List[Dict[str, Any]]:
+        return yf.Ticker(symbol).news or []
+
+    def earnings_dates(self, symbol: str) -> List[EarningsDate]:
+        frame = yf.Ticker(symbol).earnings_dates
+        if frame is None or frame.empty:
+            return []
+        dates = []
+        for timestamp, row in frame.sort_index().iterrows():
+            eps = row.get("EPS Estimate")
+            if eps is None or math.isnan(eps):
+                eps = None
+            dates.append((timestamp.to_pydatetime(), eps))
+        return dates
+
+
+def create_provider(name: str) -> MarketDataProvider:
+    """Provider for Settings.UPSTREAM_PROVIDER ("yfinance", "recording" or "fake")"""
+    if name == "yfinance":
+        return YFinanceProvider()
+    # Imported here: fake_provider subclasses MarketDataProvider
+    from app.services.fake_provider import FakeProvider, RecordingProvider
+
+    if name == "recording":
+        return RecordingProvider(YFinanceProvider(), settings.RECORDING_PATH)
+    if name == "fake":
+        return FakeProvider(
+            latency_ms=settings.FAKE_PROVIDER_LATENCY_MS,
+            jitter_ms=settings.FAKE_PROVIDER_JITTER_MS,
+            error_rate=settings.FAKE_PROVIDER_ERROR_RATE,
+            seed=settings.FAKE_PROVIDER_SEED,
+            replay_path=settings.FAKE_PROVIDER_REPLAY_PATH,
+        )
+    raise ValueError(f"Unknown upstream provider: {name}")
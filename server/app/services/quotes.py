@@ -0,0 +1,69 @@
+"""
+Quote metrics - vectorized price/change/sparkline computation
+Works on a symbols x days matrix of closing prices in a single pass
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.services.bars import BarSeries
+
+SPARKLINE_POINTS = 7
+
+
+def close_matrix(
+    histories: Dict[str, BarSeries], days: int = SPARKLINE_POINTS
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Stack the last `days` closes of each history into a right-aligned
+    matrix. Symbols with fewer bars are left-padded with NaN.
+    """
+    symbols = [s for s, h in histories.items() if h is not None and len(h) > 0]
+    matrix = np.full((len(symbols), days), np.nan, dtype=np.float64)
+    for row, symbol in enumerate(symbols):
+        closes = histories[symbol].close[-days:]
+        matrix[row, days - len(closes) :] = closes
+    return symbols, matrix
+
+
+def compute_quote_metrics(closes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Latest price, change vs previous close, change percent and rounded
+    sparkline for every row of a right-aligned, NaN-padded close matrix.
+    """
+    price = closes[:, -1]
+    if closes.shape[1] > 1:
+        prev = closes[:, -2]
+        prev = np.where(np.isnan(prev), price, prev)
+    else:
+        prev = price
+    change = price - prev
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_percent = np.where(prev != 0, change / prev * 100, 0.0)
+    return {
+        "price": np.round(price, 2),
+        "change": np.round(change, 2),
+        "change_percent": np.round(change_percent, 2),
+        "sparkline": np.round(closes[:, -SPARKLINE_POINTS:], 2),
+    }
+
+
+def summarize_histories(
+    histories: Dict[str, BarSeries],
+) -> Dict[str, Dict[str, float | List[float]]]:
+    """Per-symbol quote dicts computed from a batch of price histories"""
+    symbols, closes = close_matrix(histories)
+    if not symbols:
+        return {}
+    metrics = compute_quote_metrics(closes)
+    quotes = {}
+    for row, symbol in enumerate(symbols):
+        sparkline = metrics["sparkline"][row]
+        quotes[symbol] = {
+            "price": float(metrics["price"][row]),
+            "change": float(metrics["change"][row]),
+            "change_percent": float(metrics["change_percent"][row]),
+            "sparkline": sparkline[~np.isnan(sparkline)].tolist(),
+        }
+    return quotes
@@ -0,0 +1,182 @@
+"""
+Ticker Search - in-memory index over the symbol registry's listings
+Built on the first search; answers autocomplete queries without scanning
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Iterable, List, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words; apostrophes are dropped so "McDonald's" is one word"""
+    return TOKEN_PATTERN.findall(text.lower().replace("'", ""))
+
+
+class TickerSearchIndex:
+    """
+    Symbol prefix trie, a sorted name-token index and trigram postings for
+    substring matches. Results are ranked
+    exact symbol > symbol prefix > name word prefix > substring, with ties
+    broken by listing order (the bundled listings are sorted by prominence).
+    """
+
+    def __init__(self, listings: Iterable[Dict[str, str]], cache_size: int = 1024):
+        self._results: List[Dict[str, str]] = []
+        self._symbols: Dict[str, int] = {}
+        # Each trie node maps a char to (child node, ids of all symbols below)
+        self._trie: Dict[str, tuple] = {}
+        self._name_tokens: List[Tuple[str, ...]] = []
+        self._texts: List[str] = []
+        self._token_index: Dict[str, List[int]] = {}
+        self._trigrams: Dict[str, List[int]] = {}
+        for listing in listings:
+            self._insert(listing)
+        self._build_lookups()
+        self._search = lru_cache(maxsize=cache_size)(self._search_uncached)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def _insert(self, listing: Dict[str, str]):
+        symbol = listing["symbol"].upper()
+        if symbol in self._symbols:
+            return
+        i = len(self._results)
+        self._results.append(
+            {
+                "symbol": symbol,
+                "name": listing["name"],
+                "exchange": listing["exchange"],
+                "type": listing["type"],
+            }
+        )
+        self._symbols[symbol] = i
+        node = self._trie
+        for char in symbol:
+            child, ids = node.setdefault(char, ({}, []))
+            ids.append(i)
+            node = child
+        tokens = tuple(dict.fromkeys(tokenize(listing["name"])))
+        self._name_tokens.append(tokens)
+        for token in tokens:
+            self._token_index.setdefault(token, []).append(i)
+        text = f"{symbol.lower()} {listing['name'].lower()}"
+        self._texts.append(text)
+        for trigram in {text[j : j + 3] for j in range(len(text) - 2)}:
+            self._trigrams.setdefault(trigram, []).append(i)
+
+    def _build_lookups(self):
+        """Sorted token list and joined haystack, rebuilt after insertions"""
+        self._tokens = sorted(self._token_index)
+        self._token_ids = [self._token_index[token] for token in self._tokens]
+        # Queries too short for trigrams scan one joined string in C (str.find)
+        self._haystack = "\n".join(self._texts)
+        self._haystack_starts = list(
+            accumulate((len(text) + 1 for text in self._texts[:-1]), initial=0)
+        )
+
+    def add(self, listing: Dict[str, str]):
+        """Index a symbol registered after the index was built"""
+        if listing["symbol"].upper() in self._symbols:
+            return
+        self._insert(listing)
+        self._build_lookups()
+        self._search.cache_clear()
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        return list(self._search(query.strip().lower(), limit))
+
+    def _search_uncached(self, query: str, limit: int) -> tuple:
+        if not query:
+            return ()
+        ranked: List[int] = []
+        seen: Set[int] = set()
+
+        def take(ids: Iterable[int]) -> bool:
+            for i in ids:
+                if i not in seen:
+                    seen.add(i)
+                    ranked.append(i)
+                    if len(ranked) >= limit:
+                        return True
+            return False
+
+        symbol = query.upper()
+        exact = self._symbols.get(symbol)
+        tiers = (
+            lambda: [] if exact is None else [exact],
+            lambda: self._symbol_prefix(symbol),
+            lambda: self._word_prefix(query),
+            lambda: self._substring(query, limit + len(ranked)),
+        )
+        for tier in tiers:
+            if take(tier()):
+                break
+        return tuple(self._results[i] for i in ranked)
+
+    def _symbol_prefix(self, prefix: str) -> List[int]:
+        node, ids = self._trie, []
+        for char in prefix:
+            if char not in node:
+                return []
+            node, ids = node[char]
+        return ids
+
+    def _word_prefix(self, query: str) -> List[int]:
+        """
+        Listings whose name contains every query word, treating the last word
+        as a prefix still being typed ("bank of a" -> Bank of America)
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        *complete, partial = words
+        if complete:
+            postings = sorted(
+                (self._token_index.get(word, []) for word in complete), key=len
+            )
+            matches = set(postings[0]).intersection(*postings[1:])
+            return [
+                i
+                for i in sorted(matches)
+                if any(token.startswith(partial) for token in self._name_tokens[i])
+            ]
+        lo = bisect_left(self._tokens, partial)
+        hi = bisect_right(self._tokens, partial + "\uffff")
+        return sorted(set().union(*self._token_ids[lo:hi]))
+
+    def _substring(self, query: str, limit: int) -> List[int]:
+        if len(query) < 3:
+            return self._scan(query, limit)
+        postings = sorted(
+            (self._trigrams.get(query[j : j + 3], []) for j in range(len(query) - 2)),
+            key=len,
+        )
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return [i for i in sorted(candidates) if query in self._texts[i]][:limit]
+
+    def _scan(self, query: str, limit: int) -> List[int]:
+        ids: List[int] = []
+        position = self._haystack.find(query)
+        while position != -1 and len(ids) < limit:
+            i = bisect_right(self._haystack_starts, position) - 1
+            ids.append(i)
+            # Continue from the next listing; one hit per listing is enough
+            if i + 1 == len(self._haystack_starts):
+                break
+            position = self._haystack.find(query, self._haystack_starts[i + 1])
+        return ids
+
+    def cache_info(self) -> Dict[str, int]:
+        info = self._search.cache_info()
+        return {
+            "listings": len(self._results),
+            "hits": info.hits,
+            "misses": info.misses,
+            "cached_queries": info.currsize,
+        }
@@ -0,0 +1,124 @@
+"""
+Stock Stream Hub - fans out live watchlist updates to streaming clients
+One shared refresh loop polls the union of subscribed symbols
+"""
+
+import asyncio
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+from app.core.config import settings
+from app.services.market_data import MarketDataService
+
+
+class Subscription:
+    """
+    One client's symbol set. Updates are coalesced per symbol, so a slow
+    reader only ever receives the latest value instead of a backlog.
+    """
+
+    def __init__(self, symbols: FrozenSet[str]):
+        self.symbols = symbols
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._changed = asyncio.Event()
+
+    def push(self, symbol: str, data: Dict[str, Any]):
+        self._pending[symbol] = data
+        self._changed.set()
+
+    async def next(self, timeout: float) -> List[Dict[str, Any]]:
+        """Wait up to `timeout` seconds for changes; [] means nothing changed"""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._changed.clear()
+        items, self._pending = list(self._pending.values()), {}
+        return items
+
+
+class StockStreamHub:
+    """
+    Runs a single refresh loop while anyone is subscribed. Each tick fetches
+    the union of subscribed symbols through get_stocks_batch (so N clients
+    watching AAPL cost one upstream fetch) and pushes only the stocks whose
+    payload changed to the subscribers watching them.
+    """
+
+    def __init__(self, service: MarketDataService):
+        self.service = service
+        self.interval_seconds = settings.STREAM_INTERVAL_SECONDS
+        self._subscriptions: Set[Subscription] = set()
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.polls = 0
+        self.updates_sent = 0
+
+    def subscribe(self, symbols: List[str]) -> Subscription:
+        subscription = Subscription(frozenset(symbols))
+        self._subscriptions.add(subscription)
+        for symbol in subscription.symbols:
+            if symbol in self._latest:
+                subscription.push(symbol, self._latest[symbol])
+        # Poll right away so new symbols do not wait a full interval
+        self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+        watched = self._watched_symbols()
+        for symbol in list(self._latest):
+            if symbol not in watched:
+                del self._latest[symbol]
+
+    def _watched_symbols(self) -> Set[str]:
+        return set().union(*[s.symbols for s in self._subscriptions])
+
+    async def _run(self):
+        while self._subscriptions:
+            self._wake.clear()
+            try:
+                await self._poll()
+            except Exception as e:
+                print(f"Error refreshing stream symbols: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self):
+        symbols = sorted(self._watched_symbols())
+        if not symbols:
+            return
+        self.polls += 1
+        stocks = await self.service.get_stocks_batch(symbols)
+        for stock in stocks:
+            symbol = stock["symbol"]
+            if self._latest.get(symbol) == stock:
+                continue
+            self._latest[symbol] = stock
+            for subscription in self._subscriptions:
+                if symbol in subscription.symbols:
+                    subscription.push(symbol, stock)
+                    self.updates_sent += 1
+
+    async def stop(self):
+        self._subscriptions.clear()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscriptions),
+            "symbols": len(self._watched_symbols()),
+            "polls": self.polls,
+            "updates_sent": self.updates_sent,
+        }
@@ -0,0 +1,145 @@
+"""
+Symbol Registry - one place to resolve a ticker's name, exchange and type
+Backed by the bundled listings file plus .info enrichments cached on disk
+"""
+
+import csv
+import json
+import os
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+LISTINGS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "listings.csv"
+)
+
+# yfinance exchange codes as shown to users
+EXCHANGE_NAMES = {
+    "NMS": "NASDAQ",
+    "NGM": "NASDAQ",
+    "NCM": "NASDAQ",
+    "NAS": "NASDAQ",
+    "NYQ": "NYSE",
+    "PCX": "NYSE Arca",
+    "ASE": "NYSE American",
+    "BTS": "Cboe BZX",
+}
+
+QUOTE_TYPES = {"EQUITY": "Equity", "ETF": "ETF", "INDEX": "Index"}
+
+
+class SymbolInfo(NamedTuple):
+    symbol: str
+    name: str
+    exchange: str
+    type: str
+    sector: str
+    currency: str
+
+
+class SymbolRegistry:
+    """
+    Symbol -> SymbolInfo map, read on first lookup. Symbols missing from the
+    listings file can be enriched from a ticker.info payload; enrichments
+    are written to `cache_path` (JSON) by `flush`, which is safe to run on
+    a thread, so they survive restarts.
+    """
+
+    def __init__(self, cache_path: str = "", listings_path: str = LISTINGS_PATH):
+        self.cache_path = cache_path
+        self.listings_path = listings_path
+        self._entries: Optional[Dict[str, SymbolInfo]] = None
+        self._enriched: Dict[str, SymbolInfo] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @property
+    def entries(self) -> Dict[str, SymbolInfo]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> Dict[str, SymbolInfo]:
+        entries = {}
+        with open(self.listings_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                info = SymbolInfo(**{field: row[field] for field in SymbolInfo._fields})
+                entries[info.symbol] = info
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, encoding="utf-8") as f:
+                    for values in json.load(f).values():
+                        info = SymbolInfo(*values)
+                        self._enriched[info.symbol] = info
+                        entries.setdefault(info.symbol, info)
+            except (OSError, ValueError, TypeError) as e:
+                print(f"Error reading symbol cache {self.cache_path}: {e}")
+        return entries
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, symbol: str) -> Optional[SymbolInfo]:
+        return self.entries.get(symbol)
+
+    def name(self, symbol: str) -> str:
+        info = self.entries.get(symbol)
+        return info.name if info else symbol
+
+    def listings(self) -> List[Dict[str, str]]:
+        return [info._asdict() for info in self.entries.values()]
+
+    def enrich(self, symbol: str, info: Dict[str, Any]) -> Optional[SymbolInfo]:
+        """Register an unknown symbol from its ticker.info; None if info has no name"""
+        if symbol in self.entries:
+            return self.entries[symbol]
+        name = info.get("longName") or info.get("shortName")
+        if not name:
+            return None
+        exchange = info.get("exchange") or ""
+        quote_type = info.get("quoteType") or ""
+        entry = SymbolInfo(
+            symbol=symbol,
+            name=name,
+            exchange=EXCHANGE_NAMES.get(exchange, exchange),
+            type=QUOTE_TYPES.get(quote_type, quote_type.title()),
+            sector=info.get("sector") or "",
+            currency=info.get("currency") or "USD",
+        )
+        self.entries[symbol] = entry
+        with self._lock:
+            self._enriched[symbol] = entry
+            self._dirty = bool(self.cache_path)
+        return entry
+
+    @property
+    def dirty(self) -> bool:
+        """Enrichments not yet written to `cache_path`"""
+        return self._dirty
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            enriched = {s: list(e) for s, e in self._enriched.items()}
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(enriched, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Error writing symbol cache {self.cache_path}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "loaded": self._entries is not None,
+            "symbols": len(self._entries or {}),
+            "enriched": len(self._enriched),
+        }
@@ -0,0 +1,340 @@
+"""
+Load benchmark: every API route in-process against the offline FakeProvider
+Cold cache, warm cache and thundering-herd scenarios, saved and compared as JSON
+
+Run from server/:
+    python -m benchmarks.bench_api --output before.json
+    python -m benchmarks.bench_api --output after.json --baseline before.json
+    python -m benchmarks.bench_api --compare before.json after.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.core.config import settings
+from app.services.fake_provider import FakeProvider
+
+# (name, path, query string)
+ROUTES = [
+    ("health", "/health", ""),
+    ("health_stats", "/health/stats", ""),
+    ("search", "/api/search", "q=app"),
+    ("stocks", "/api/stocks", "symbols=AAPL,MSFT,GOOGL,AMZN,NVDA,META,TSLA,JPM"),
+    ("stock_detail", "/api/stocks/AAPL", ""),
+    ("stream", "/api/stream/stocks", "symbols=AAPL,MSFT,NVDA"),
+    ("snapshot", "/api/market/snapshot", ""),
+    ("status", "/api/market/status", ""),
+    ("sectors", "/api/market/sectors", ""),
+    ("news", "/api/market/news", ""),
+    ("featured_news", "/api/market/news/featured", ""),
+    ("ratings", "/api/market/ratings", ""),
+    ("earnings", "/api/market/earnings", ""),
+    ("dividends", "/api/market/dividends", ""),
+    ("week_highs_lows", "/api/market/week-highs-lows", ""),
+    ("dashboard", "/api/dashboard", ""),
+]
+
+# Streams never finish; they are timed to their first update
+STREAM_MARKER = b"event: update"
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "rps", "upstream_per_request")
+
+
+class Harness:
+    """
+    Drives the ASGI app directly (no sockets) with fresh service singletons
+    per scenario, so every run starts from the same state
+    """
+
+    def __init__(self, provider: FakeProvider):
+        # Imported late: the module builds its singletons from settings
+        from app import main
+
+        self.main = main
+        self.provider = provider
+
+    async def reset(self):
+        from app.core.responses import ResponseCache
+        from app.services.market_data import MarketDataService
+        from app.services.streaming import StockStreamHub
+
+        main = self.main
+        await main.stream_hub.stop()
+        main.market_service.shutdown()
+        main.market_service = MarketDataService(self.provider)
+        main.stream_hub = StockStreamHub(main.market_service)
+        main.response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+    async def close(self):
+        await self.main.stream_hub.stop()
+        self.main.market_service.shutdown()
+
+    def upstream_calls(self) -> int:
+        return sum(self.provider.calls.values())
+
+    async def get(self, path: str, query: str) -> Tuple[int, float]:
+        """One GET through the app; returns (status, seconds)"""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+        }
+        disconnect = asyncio.Event()
+        requested = False
+        status = 0
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                if not message.get("more_body") or STREAM_MARKER in message.get(
+                    "body", b""
+                ):
+                    disconnect.set()
+
+        start = time.perf_counter()
+        await self.main.app(scope, receive, send)
+        return status, time.perf_counter() - start
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(
+    scenario: str,
+    route: str,
+    timings: List[Tuple[int, float]],
+    wall: float,
+    upstream_calls: int,
+) -> Dict[str, Any]:
+    latencies = [seconds * 1000 for _, seconds in timings]
+    return {
+        "scenario": scenario,
+        "route": route,
+        "requests": len(timings),
+        "errors": sum(1 for status, _ in timings if status >= 400),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "rps": round(len(timings) / wall, 1) if wall else 0.0,
+        "upstream_per_request": round(upstream_calls / len(timings), 3),
+    }
+
+
+def reset_peak_rss() -> bool:
+    """
+    Restart the kernel's resident-set high-water mark (VmHWM) from the
+    current RSS, so the next peak_rss_mb covers one scenario only. Linux.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss_mb() -> float:
+    """VmHWM in MB, since the last reset_peak_rss"""
+    with open("/proc/self/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    return math.nan
+
+
+async def run_cold(harness: Harness, name: str, path: str, query: str, runs: int):
+    """Each request against freshly reset caches"""
+    timings, calls, wall = [], 0, 0.0
+    for _ in range(runs):
+        await harness.reset()
+        before = harness.upstream_calls()
+        result = await harness.get(path, query)
+        timings.append(result)
+        wall += result[1]
+        calls += harness.upstream_calls() - before
+    return summarize("cold", name, timings, wall, calls)
+
+
+async def run_warm(
+    harness: Harness, name: str, path: str, query: str, requests: int, workers: int
+):
+    """One priming request, then `requests` more from `workers` concurrent clients"""
+    await harness.reset()
+    await harness.get(path, query)
+    before = harness.upstream_calls()
+    timings: List[Tuple[int, float]] = []
+    remaining = iter(range(requests))
+
+    async def client():
+        for _ in remaining:
+            timings.append(await harness.get(path, query))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(workers)])
+    wall = time.perf_counter() - start
+    return summarize("warm", name, timings, wall, harness.upstream_calls() - before)
+
+
+async def run_herd(harness: Harness, name: str, path: str, query: str, clients: int):
+    """`clients` identical requests at once against a cold cache"""
+    await harness.reset()
+    before = harness.upstream_calls()
+    start = time.perf_counter()
+    timings = await asyncio.gather(*[harness.get(path, query) for _ in range(clients)])
+    wall = time.perf_counter() - start
+    return summarize("herd", name, timings, wall, harness.upstream_calls() - before)
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    provider = FakeProvider(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    harness = Harness(provider)
+    routes = [r for r in ROUTES if not args.routes or r[0] in args.routes]
+    results = []
+    try:
+        for scenario in args.scenarios:
+            for name, path, query in routes:
+                # Without a reset the process-wide peak only ever grows from
+                # one scenario to the next, so it is left out (NaN)
+                resettable = reset_peak_rss()
+                if scenario == "cold":
+                    result = await run_cold(harness, name, path, query, args.cold_runs)
+                elif scenario == "warm":
+                    result = await run_warm(
+                        harness, name, path, query, args.requests, args.workers
+                    )
+                else:
+                    result = await run_herd(harness, name, path, query, args.clients)
+                result["peak_rss_mb"] = peak_rss_mb() if resettable else math.nan
+                results.append(result)
+                print_row(result)
+    finally:
+        await harness.close()
+    return results
+
+
+def print_header():
+    print(
+        f"{'scenario':<6} {'route':<16} {'reqs':>5} {'err':>4} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'up/req':>7} {'peak MB':>7}"
+    )
+
+
+def print_row(r: Dict[str, Any]):
+    print(
+        f"{r['scenario']:<6} {r['route']:<16} {r['requests']:>5} {r['errors']:>4} "
+        f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+        f"{r['rps']:>9.1f} {r['upstream_per_request']:>7.2f} {r['peak_rss_mb']:>7.1f}"
+    )
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]):
+    """Per (scenario, route): baseline -> current with the relative change"""
+    previous = {(r["scenario"], r["route"]): r for r in baseline["results"]}
+    print(f"\n{'scenario':<6} {'route':<16} " + " ".join(f"{m:>26}" for m in METRICS))
+    for r in current["results"]:
+        base = previous.get((r["scenario"], r["route"]))
+        if base is None:
+            continue
+        cells = []
+        for metric in METRICS:
+            old, new = base[metric], r[metric]
+            change = f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+            cells.append(f"{old:>9.2f} -> {new:>9.2f} {change:>5}")
+        print(f"{r['scenario']:<6} {r['route']:<16} " + " ".join(cells))
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def configure(args: argparse.Namespace):
+    """In-memory, offline settings; the upstream limiter is opened wide by default"""
+    settings.UPSTREAM_PROVIDER = "fake"
+    settings.PREFETCH_ENABLED = False
+    settings.HISTORY_STORE_PATH = ""
+    settings.SYMBOL_CACHE_PATH = ""
+    settings.LAST_GOOD_PATH = ""
+    settings.UPSTREAM_RATE_PER_SECOND = args.rate
+    settings.UPSTREAM_RATE_BURST = max(1, int(args.rate))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scenarios", nargs="+", default=["cold", "warm", "herd"],
+        choices=["cold", "warm", "herd"],
+    )  # fmt: skip
+    parser.add_argument("--routes", nargs="+", help="route names (default: all)")
+    parser.add_argument("--cold-runs", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=500, help="warm requests")
+    parser.add_argument("--workers", type=int, default=10, help="warm clients")
+    parser.add_argument("--clients", type=int, default=100, help="herd size")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate", type=float, default=1000.0, help="upstream calls/s")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against an earlier --output")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+        help="compare two saved runs without running anything",
+    )  # fmt: skip
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(load(args.compare[0]), load(args.compare[1]))
+        return
+
+    configure(args)
+    print_header()
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output",)},
+        },
+        "results": asyncio.run(run(args)),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        compare(load(args.baseline), report)
+
+
+if __name__ == "__main__":
+    main()
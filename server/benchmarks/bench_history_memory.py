@@ -0,0 +1,77 @@
+"""
+Memory benchmark: per-symbol footprint of cached price histories
+Compares yfinance-style pandas DataFrames with the compact BarSeries
+
+Run from server/:
+    python -m benchmarks.bench_history_memory --symbols 500 --days 22
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from app.services.bars import BarSeries
+
+
+def make_frame(rng: np.random.Generator, days: int) -> pd.DataFrame:
+    """Shape of Ticker.history(period="1mo"): 7 columns, tz-aware index"""
+    index = pd.date_range("2024-01-01", periods=days, tz="America/New_York")
+    close = 100 + rng.standard_normal(days).cumsum()
+    return pd.DataFrame(
+        {
+            "Open": close - 0.5,
+            "High": close + 1.0,
+            "Low": close - 1.0,
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 50_000_000, days),
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+
+
+def measure(build: Callable[[], Dict[str, object]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=22)
+    args = parser.parse_args()
+
+    def frames() -> Dict[str, object]:
+        rng = np.random.default_rng(42)
+        return {f"SYM{i}": make_frame(rng, args.days) for i in range(args.symbols)}
+
+    def series() -> Dict[str, object]:
+        # Source frames are dropped right after conversion, as at the fetch boundary
+        rng = np.random.default_rng(42)
+        return {
+            f"SYM{i}": BarSeries.from_frame(make_frame(rng, args.days))
+            for i in range(args.symbols)
+        }
+
+    results = {"DataFrame": measure(frames), "BarSeries": measure(series)}
+    for label, total in results.items():
+        per_symbol = total / args.symbols
+        print(f"{label:>9}: {per_symbol / 1024:7.2f} KiB per symbol ({args.days} bars)")
+    ratio = results["DataFrame"] / results["BarSeries"]
+    print(f"BarSeries uses {ratio:.1f}x less memory per symbol")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark: per-ticker scalar quote math vs the vectorized kernel
+
+Run from server/:
+    python -m benchmarks.bench_quote_metrics --symbols 100 --days 22
+"""
+
+import argparse
+import timeit
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from app.services.bars import BarSeries
+from app.services.quotes import summarize_histories
+
+
+def make_histories(symbols: int, days: int) -> Dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(42)
+    index = pd.date_range("2024-01-01", periods=days, tz="America/New_York")
+    return {
+        f"SYM{i}": pd.DataFrame(
+            {"Close": 100 + rng.standard_normal(days).cumsum()}, index=index
+        )
+        for i in range(symbols)
+    }
+
+
+def per_ticker(histories: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, Any]]:
+    """The pre-kernel path from MarketDataService.get_stock_data, one ticker at a time"""
+    quotes = {}
+    for symbol, hist in histories.items():
+        closing_prices = hist["Close"].tolist()
+        sparkline = closing_prices[-7:] if len(closing_prices) >= 7 else closing_prices
+        current_price = hist["Close"].iloc[-1]
+        prev_close = hist["Close"].iloc[-2] if len(hist) > 1 else current_price
+        change = current_price - prev_close
+        change_percent = (change / prev_close) * 100 if prev_close else 0
+        quotes[symbol] = {
+            "price": round(float(current_price), 2),
+            "change": round(float(change), 2),
+            "change_percent": round(float(change_percent), 2),
+            "sparkline": [round(float(p), 2) for p in sparkline],
+        }
+    return quotes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--days", type=int, default=22)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    frames = make_histories(args.symbols, args.days)
+    # Histories are converted to BarSeries once at the fetch boundary
+    series = {symbol: BarSeries.from_frame(f) for symbol, f in frames.items()}
+    assert per_ticker(frames) == summarize_histories(series)
+
+    cases = (
+        ("per-ticker", per_ticker, frames),
+        ("vectorized", summarize_histories, series),
+    )
+    for label, fn, histories in cases:
+        best = min(
+            timeit.repeat(lambda: fn(histories), repeat=args.repeat, number=args.number)
+        )
+        per_call_ms = best / args.number * 1000
+        print(f"{label:>11}: {per_call_ms:8.3f} ms per batch of {args.symbols}")
+
+
+if __name__ == "__main__":
+    main()
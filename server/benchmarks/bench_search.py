@@ -0,0 +1,88 @@
+"""
+Micro-benchmark: ticker search latency over a large listings universe
+
+Run from server/:
+    python -m benchmarks.bench_search --listings 12000
+"""
+
+import argparse
+import csv
+import random
+import string
+import timeit
+from typing import Dict, List
+
+from app.services.search import TickerSearchIndex
+from app.services.symbols import LISTINGS_PATH
+
+QUERIES = ["a", "aapl", "ap", "micro", "bank of", "semiconductor", "ola", "xq", "s&p"]
+
+WORDS = [
+    "global", "holdings", "capital", "energy", "systems", "therapeutics",
+    "financial", "group", "technologies", "resources", "bancorp", "pharma",
+    "industries", "partners", "networks", "realty", "acquisition", "brands",
+]  # fmt: skip
+
+
+def make_listings(count: int) -> List[Dict[str, str]]:
+    """The bundled listings padded with synthetic ones up to `count`"""
+    with open(LISTINGS_PATH, newline="", encoding="utf-8") as f:
+        listings = list(csv.DictReader(f))
+    rng = random.Random(42)
+    symbols = {listing["symbol"] for listing in listings}
+    while len(listings) < count:
+        symbol = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5)))
+        if symbol in symbols:
+            continue
+        symbols.add(symbol)
+        name = " ".join(w.title() for w in rng.sample(WORDS, rng.randint(1, 3)))
+        listings.append(
+            {
+                "symbol": symbol,
+                "name": f"{symbol.title()} {name} Inc.",
+                "exchange": rng.choice(["NASDAQ", "NYSE"]),
+                "type": "Equity",
+            }
+        )
+    return listings
+
+
+def linear_scan(listings: List[Dict[str, str]], query: str) -> List[Dict[str, str]]:
+    """The pre-index path from MarketDataService.search_tickers"""
+    query_lower = query.lower()
+    return [
+        s
+        for s in listings
+        if query_lower in s["symbol"].lower() or query_lower in s["name"].lower()
+    ][:5]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--listings", type=int, default=12000)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    listings = make_listings(args.listings)
+    build = timeit.timeit(lambda: TickerSearchIndex(listings), number=1)
+    # cache_size=0 times the index itself rather than the hot-query LRU
+    index = TickerSearchIndex(listings, cache_size=0)
+    cached = TickerSearchIndex(listings)
+    print(f"{len(index)} listings, index built in {build * 1000:.1f} ms\n")
+    print(f"{'query':>14} {'linear':>10} {'indexed':>10} {'cached':>10}  top result")
+    for query in QUERIES:
+        timings = [
+            timeit.timeit(fn, number=args.number) / args.number * 1e6
+            for fn in (
+                lambda: linear_scan(listings, query),
+                lambda: index.search(query, 5),
+                lambda: cached.search(query, 5),
+            )
+        ]
+        results = index.search(query, 5)
+        top = results[0]["symbol"] if results else "-"
+        print(f"{query!r:>14} " + " ".join(f"{t:8.1f}us" for t in timings) + f"  {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Shared fixtures. Run from server/ with: python -m pytest
+Everything runs offline against FakeProvider with on-disk stores disabled.
+"""
+
+import httpx
+import pytest
+
+from app.core.config import settings
+
+settings.HISTORY_STORE_PATH = ""
+settings.LAST_GOOD_PATH = ""
+settings.SYMBOL_CACHE_PATH = ""
+settings.SHARED_CACHE_PATH = ""
+settings.PREFETCH_ENABLED = False
+settings.UPSTREAM_PROVIDER = "fake"
+settings.UPSTREAM_RATE_PER_SECOND = 1000.0
+settings.UPSTREAM_RATE_BURST = 1000
+settings.UPSTREAM_BREAKER_FAILURES = 3
+settings.UPSTREAM_BATCH_WINDOW_MS = 1
+
+from app import main  # noqa: E402
+from app.core.responses import ResponseCache  # noqa: E402
+from app.services.fake_provider import FakeProvider  # noqa: E402
+from app.services.market_data import MarketDataService  # noqa: E402
+
+
+@pytest.fixture
+def provider() -> FakeProvider:
+    return FakeProvider()
+
+
+@pytest.fixture
+def service(provider: FakeProvider):
+    service = MarketDataService(provider)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def client(service):
+    """ASGI client for the app, served by `service` with an empty response cache"""
+    previous = main.market_service, main.response_cache
+    main.market_service = service
+    main.response_cache = ResponseCache()
+    transport = httpx.ASGITransport(app=main.app)
+    yield httpx.AsyncClient(transport=transport, base_url="http://test")
+    main.market_service, main.response_cache = previous
@@ -0,0 +1,31 @@
+import numpy as np
+
+from app.services.bars import BarSeries
+
+
+def series(days, closes):
+    dates = np.array(days, dtype="datetime64[D]")
+    closes = np.array(closes, dtype=np.float64)
+    return BarSeries(dates, closes, closes, closes, closes, np.ones(len(closes)))
+
+
+def test_merge_overlays_newer_bars_in_date_order():
+    old = series(["2026-10-12", "2026-10-13", "2026-10-14"], [1.0, 2.0, 3.0])
+    new = series(["2026-10-15", "2026-10-14"], [5.0, 4.0])
+    merged = old.merge(new)
+    assert [str(d) for d in merged.dates] == [
+        "2026-10-12",
+        "2026-10-13",
+        "2026-10-14",
+        "2026-10-15",
+    ]
+    assert merged.close.tolist() == [1.0, 2.0, 4.0, 5.0]
+    assert merged.tail(2).close.tolist() == [4.0, 5.0]
+
+
+def test_same_basis_ignores_our_last_bar_and_catches_readjusted_prices():
+    old = series(["2026-10-12", "2026-10-13", "2026-10-14"], [1.0, 2.0, 3.0])
+    # Our last bar was fetched mid-session; the settled close differs
+    assert old.same_basis(series(["2026-10-13", "2026-10-14"], [2.0, 3.3]))
+    # After a 2:1 split upstream halves every past close
+    assert not old.same_basis(series(["2026-10-13", "2026-10-14"], [1.0, 1.5]))
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.core.batcher import BatchLoader
+
+
+def test_keys_within_the_window_share_one_load():
+    batches = []
+
+    async def load_many(keys):
+        batches.append(sorted(keys))
+        return {key: key.lower() for key in keys if key != "NONE"}
+
+    async def run():
+        loader = BatchLoader(load_many, window_seconds=0.01)
+        results = await asyncio.gather(
+            loader.load("A"), loader.load("B"), loader.load("A"), loader.load("NONE")
+        )
+        assert results == ["a", "b", "a", None]
+        assert await loader.load("C") == "c"
+
+    asyncio.run(run())
+    assert batches == [["A", "B", "NONE"], ["C"]]
+
+
+def test_full_batch_dispatches_before_the_window_ends():
+    batches = []
+
+    async def load_many(keys):
+        batches.append(list(keys))
+        return {}
+
+    async def run():
+        loader = BatchLoader(load_many, window_seconds=60, max_batch_size=2)
+        await asyncio.wait_for(
+            asyncio.gather(loader.load("A"), loader.load("B")), timeout=1
+        )
+
+    asyncio.run(run())
+    assert batches == [["A", "B"]]
+
+
+def test_exception_values_fail_only_their_own_key():
+    async def load_many(keys):
+        return {"A": 1, "B": ValueError("no data for B")}
+
+    async def run():
+        loader = BatchLoader(load_many)
+        a, b = await asyncio.gather(
+            loader.load("A"), loader.load("B"), return_exceptions=True
+        )
+        assert a == 1
+        assert isinstance(b, ValueError)
+
+    asyncio.run(run())
+
+
+def test_failed_load_fails_every_key_in_the_batch():
+    async def load_many(keys):
+        raise ConnectionError("upstream down")
+
+    async def run():
+        loader = BatchLoader(load_many)
+        with pytest.raises(ConnectionError):
+            await asyncio.gather(loader.load("A"), loader.load("B"))
+
+    asyncio.run(run())
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.core.breaker import CircuitBreaker, CircuitOpenError
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert 0 < breaker.retry_in <= 60
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    with patch("app.core.breaker.monotonic", return_value=100.0):
+        breaker.record_failure()
+    with patch("app.core.breaker.monotonic", return_value=111.0):
+        breaker.before_call()
+        assert breaker.state == "half_open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+
+def test_probe_success_closes_and_unstarted_probe_is_released():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    with patch("app.core.breaker.monotonic", return_value=100.0):
+        breaker.record_failure()
+    with patch("app.core.breaker.monotonic", return_value=111.0):
+        breaker.before_call()
+        breaker.release_probe()
+        breaker.before_call()
+        breaker.record_success()
+    assert breaker.state == "closed"
+    assert not breaker.is_open
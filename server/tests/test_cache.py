@@ -0,0 +1,30 @@
+from app.core.cache import CacheEntry, LRUCache
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", CacheEntry(1))
+    cache.set("b", CacheEntry(2))
+    cache.get("a")
+    cache.set("c", CacheEntry(3))
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.evictions == 1
+
+
+def test_byte_budget_evicts_but_keeps_the_newest_entry():
+    big = ["x" * 1000]
+    cache = LRUCache(max_entries=10, max_bytes=CacheEntry(big).size + 100)
+    cache.set("a", CacheEntry(big))
+    cache.set("b", CacheEntry(big))
+    assert "a" not in cache and "b" in cache
+    cache.set("huge", CacheEntry(big * 10))
+    assert list(cache._entries) == ["huge"]
+    assert cache.stats()["bytes"] == CacheEntry(big * 10).size
+
+
+def test_purge_drops_entries_past_their_grace_window():
+    cache = LRUCache()
+    cache.set("gone", CacheEntry(1, ttl_seconds=-10, grace_seconds=5))
+    cache.set("stale", CacheEntry(1, ttl_seconds=-10, grace_seconds=60))
+    assert cache.purge_expired() == 1
+    assert "stale" in cache and "gone" not in cache
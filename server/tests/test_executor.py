@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.breaker import CircuitBreaker, CircuitOpenError
+from app.core.executor import UpstreamExecutor
+
+
+def test_abandoned_calls_hold_their_slot_and_do_not_trip_the_breaker():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.1)
+        with lock:
+            active -= 1
+
+    async def run():
+        executor = UpstreamExecutor(
+            max_workers=2, max_concurrency=2, breaker=CircuitBreaker(2, 60)
+        )
+
+        async def call():
+            try:
+                await asyncio.wait_for(executor.run(slow), 0.02)
+            except asyncio.TimeoutError:
+                pass
+
+        await asyncio.gather(*[call() for _ in range(6)])
+        # Every caller gave up, but the two started threads still hold slots
+        assert executor.running == 2
+        await asyncio.sleep(0.2)
+        assert executor.running == 0
+        assert executor.completed == 2
+        assert executor.breaker.state == "closed"
+        executor.shutdown()
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+def test_upstream_errors_open_the_breaker():
+    def fail():
+        raise RuntimeError("429 Too Many Requests")
+
+    async def run():
+        executor = UpstreamExecutor(breaker=CircuitBreaker(2, 60))
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await executor.run(fail)
+        assert executor.breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            await executor.run(time.time)
+        assert executor.failed == 2
+        executor.shutdown()
+
+    asyncio.run(run())
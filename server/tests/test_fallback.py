@@ -0,0 +1,125 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.core.breaker import CircuitOpenError
+from app.core.config import settings
+
+
+def test_last_good_value_is_served_stale_when_upstream_fails(service, provider):
+    async def run():
+        fresh = await service.get_news()
+        assert fresh and not any(item.get("stale") for item in fresh)
+        service._cache.clear()
+        provider.error_rate = 1.0
+        served = await service.get_news()
+        assert [item["title"] for item in served] == [item["title"] for item in fresh]
+        assert all(item["stale"] and item["as_of"] for item in served)
+
+    asyncio.run(run())
+
+
+def test_open_circuit_without_last_good_raises(service, provider):
+    provider.error_rate = 1.0
+
+    async def run():
+        # Three failing fan-out calls open the breaker (UPSTREAM_BREAKER_FAILURES)
+        with pytest.raises(CircuitOpenError):
+            await service.get_news()
+        assert service.circuit_state() == "open"
+        with pytest.raises(CircuitOpenError):
+            await service.get_stock_detail("AAPL")
+        with pytest.raises(CircuitOpenError):
+            await service.get_stocks_batch(["AAPL", "MSFT"])
+
+    asyncio.run(run())
+
+
+def test_routes_answer_503_while_circuit_is_open(client, service, provider):
+    provider.error_rate = 1.0
+
+    async def run():
+        async with client:
+            await client.get("/api/market/news")
+            assert service.circuit_state() == "open"
+            for path in (
+                "/api/stocks/AAPL",
+                "/api/stocks?symbols=AAPL,MSFT",
+                "/api/market/sectors",
+                "/api/market/ratings",
+                "/api/market/news/featured",
+            ):
+                response = await client.get(path)
+                assert response.status_code == 503, path
+                assert int(response.headers["retry-after"]) >= 1
+
+    asyncio.run(run())
+
+
+def test_partial_fan_out_keeps_complete_last_good(service, provider):
+    async def run():
+        complete = await service.get_analyst_ratings()
+        service._cache.clear()
+        provider.error_rate = 0.5
+        partial = await service._load_analyst_ratings(service.TOP_SYMBOLS[:6])
+        assert len(partial) < len(complete)
+        data, _ = service._last_good.get("ratings")
+        assert data == complete
+
+    asyncio.run(run())
+
+
+def ttl_of(service, key):
+    entry = service._cache.get(key)
+    return (entry.expires_at - datetime.now()).total_seconds()
+
+
+@pytest.mark.parametrize("session", ["regular", "closed"])
+def test_previous_bars_after_failed_refresh_are_marked_stale(
+    service, provider, session
+):
+    service.market_session = lambda now=None: session
+    # While closed, bars fetched before the last session ended need a refresh
+    service._last_session_end = lambda now=None: (
+        None if session != "closed" else datetime.now().astimezone()
+    )
+
+    async def run():
+        fresh = await service.get_stock_data("AAPL")
+        assert "stale" not in fresh
+        service._cache.clear()
+        provider.error_rate = 1.0
+        served = await service.get_stock_data("AAPL")
+        assert served["stale"] and served["as_of"]
+        assert served["price"] == fresh["price"]
+        assert ttl_of(service, "stock:AAPL") <= settings.UPSTREAM_PARTIAL_TTL
+        data, _ = service._last_good.get("stock:AAPL")
+        assert data == fresh
+
+    asyncio.run(run())
+
+
+def test_snapshot_with_stale_parts_is_kept_briefly(service, provider):
+    service.market_session = lambda now=None: "closed"
+    service._last_session_end = lambda now=None: datetime.now().astimezone()
+
+    async def run():
+        complete = await service.get_market_snapshot()
+        assert ttl_of(service, "market_snapshot") > settings.UPSTREAM_PARTIAL_TTL
+        service._cache.clear()
+        provider.error_rate = 1.0
+        partial = await service._load_market_snapshot()
+        assert all(index["stale"] for index in partial["indices"])
+        assert ttl_of(service, "market_snapshot") <= settings.UPSTREAM_PARTIAL_TTL
+        data, _ = service._last_good.get("market_snapshot")
+        assert data == complete
+
+        # Once upstream recovers the next load is complete again
+        provider.error_rate = 0.0
+        service._cache.clear()
+        service._upstream.breaker.record_success()
+        recovered = await service._load_market_snapshot()
+        assert not any(index.get("stale") for index in recovered["indices"])
+
+    asyncio.run(run())
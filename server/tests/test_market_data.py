@@ -0,0 +1,127 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.core.cache import CacheEntry
+from app.services.bars import BarSeries
+from app.services.history_store import HistoryStore
+
+
+@pytest.mark.parametrize("outcome", [{}, ConnectionError("upstream down")])
+def test_unknown_symbol_lookup_is_not_repeated_per_request(service, provider, outcome):
+    lookups = []
+
+    def info(symbol):
+        lookups.append(symbol)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    provider.info = info
+
+    async def run():
+        for _ in range(5):
+            assert service._symbol_name("ZZZQX") == "ZZZQX"
+            await asyncio.gather(*service._refresh_tasks, return_exceptions=True)
+
+    asyncio.run(run())
+    assert lookups == ["ZZZQX"]
+
+
+def halved(histories):
+    """Bars as upstream reports them after a 2:1 split"""
+    return {
+        symbol: BarSeries(
+            bars.dates,
+            *[getattr(bars, name) / 2 for name in BarSeries.__slots__[1:5]],
+            bars.volume,
+        )
+        for symbol, bars in histories.items()
+    }
+
+
+@pytest.fixture
+def history_calls(service, provider):
+    """Start of each history request (None for a full period); always trading"""
+    service.market_session = lambda now=None: "regular"
+    calls = []
+    history = provider.history
+
+    def recording_history(symbols, period="1mo", start=None):
+        calls.append(start)
+        result = history(symbols, period, start)
+        return halved(result) if provider.split else result
+
+    provider.split = False
+    provider.history = recording_history
+    return calls
+
+
+def test_known_bars_only_fetch_and_merge_the_tail(service, history_calls):
+    async def run():
+        first, _, _ = await service._load_histories(["AAPL"])
+        second, errors, fallbacks = await service._load_histories(["AAPL"])
+        return first["AAPL"], second["AAPL"], errors, fallbacks
+
+    first, second, errors, fallbacks = asyncio.run(run())
+    # Overlap starts at our second-to-last bar so its settled close is checked
+    assert history_calls == [None, str(first.dates[-2])]
+    assert not errors and not fallbacks
+    assert second.dates.tolist() == first.dates.tolist()
+    assert second.close.tolist() == first.close.tolist()
+
+
+def test_readjusted_tail_triggers_a_full_refetch(
+    service, provider, history_calls, tmp_path
+):
+    service._history_store = HistoryStore(str(tmp_path / "history.sqlite3"))
+
+    async def run():
+        before, _, _ = await service._load_histories(["AAPL"])
+        provider.split = True
+        after, _, _ = await service._load_histories(["AAPL"])
+        return before["AAPL"], after["AAPL"]
+
+    before, after = asyncio.run(run())
+    assert history_calls == [None, str(before.dates[-2]), None]
+    # Every bar is on the new basis, in memory and on disk
+    assert np.allclose(after.close, before.close / 2)
+    stored = service._history_store.load_many(["AAPL"])["AAPL"].bars
+    assert np.allclose(stored.close, before.close / 2)
+
+
+def test_failed_full_refetch_keeps_the_old_basis(service, provider, history_calls):
+    async def run():
+        before, _, _ = await service._load_histories(["AAPL"])
+        provider.split = True
+        history = provider.history
+
+        def tail_only(symbols, period="1mo", start=None):
+            if start is None:
+                raise ConnectionError("upstream down")
+            return history(symbols, period, start)
+
+        provider.history = tail_only
+        after, _, fallbacks = await service._load_histories(["AAPL"])
+        return before["AAPL"], after["AAPL"], fallbacks
+
+    before, after, fallbacks = asyncio.run(run())
+    assert after.close.tolist() == before.close.tolist()
+    # Served from the previous bars, so the quote is marked stale
+    assert "AAPL" in fallbacks
+
+
+def test_expired_entry_in_grace_is_served_while_refreshing(service, provider):
+    async def run():
+        news = await service.get_news()
+        calls = provider.calls["news"]
+        ttl, grace = service._cache_policy("news")
+        service._cache.set("news", CacheEntry(news, -1, grace))
+        assert await service.get_news() == news
+        assert service._cache_counters["stale_served"] == 1
+        await asyncio.gather(*service._refresh_tasks)
+        assert provider.calls["news"] > calls
+        assert service._cache.get("news").is_valid()
+
+    asyncio.run(run())
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from app.core import profiler
+from app.core.profiler import ProfilerBusyError, profile
+
+
+def test_profile_runs_one_at_a_time_on_its_own_thread():
+    async def run():
+        first = asyncio.create_task(profile(0.05, 0.005))
+        await asyncio.sleep(0)
+        with pytest.raises(ProfilerBusyError):
+            await profile(0.05)
+        stacks = await first
+        assert any(stack.startswith("MainThread;") for stack in stacks)
+        assert not any(stack.startswith("profiler;") for stack in stacks)
+        # Free again once the first profile's thread has finished
+        assert await profile(0.01)
+
+    asyncio.run(run())
+
+
+def test_sampling_error_reaches_the_caller(monkeypatch):
+    def broken(seconds, interval):
+        raise RuntimeError("no frames")
+
+    monkeypatch.setattr(profiler, "sample", broken)
+
+    async def run():
+        with pytest.raises(RuntimeError, match="no frames"):
+            await asyncio.wait_for(profile(0.01), timeout=5)
+        # The lock was released, so the next profile runs
+        monkeypatch.undo()
+        assert await profile(0.01)
+
+    asyncio.run(run())
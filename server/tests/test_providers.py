@@ -0,0 +1,102 @@
+import asyncio
+
+import pandas as pd
+import pytest
+from yfinance.exceptions import YFPricesMissingError
+
+from app.core.config import settings
+from app.services import providers
+from app.services.fake_provider import FakeProvider, RecordingProvider
+from app.services.market_data import MarketDataService
+from app.services.providers import YFinanceProvider
+
+
+class StubTicker:
+    """Stands in for yf.Ticker: history() returns or raises per symbol"""
+
+    outcomes = {}
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, **kwargs):
+        assert kwargs["raise_errors"] is True
+        outcome = self.outcomes[self.symbol]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def stub_ticker(monkeypatch):
+    monkeypatch.setattr(providers.yf, "Ticker", StubTicker)
+    return StubTicker.outcomes
+
+
+def frame(closes):
+    index = pd.date_range("2026-10-12", periods=len(closes), freq="D", tz="UTC")
+    return pd.DataFrame({"Close": closes, "Volume": 1.0}, index=index)
+
+
+def test_missing_symbol_or_empty_range_is_not_an_upstream_failure(stub_ticker):
+    stub_ticker.update(
+        AAPL=frame([1.0, 2.0]),
+        GONE=YFPricesMissingError("GONE", "(1d 2026-10-12 -> 2026-10-13)"),
+        HOLIDAY=frame([]),
+    )
+    histories = YFinanceProvider().history(["AAPL", "GONE", "HOLIDAY"])
+    assert list(histories) == ["AAPL"]
+    assert histories["AAPL"].close.tolist() == [1.0, 2.0]
+
+
+def test_throttling_raises_when_nothing_loaded(stub_ticker):
+    stub_ticker.update(
+        AAPL=ValueError("Expecting value: line 1 column 1 (char 0)"),
+        MSFT=YFPricesMissingError("MSFT", "(Yahoo status_code = 429)"),
+    )
+    with pytest.raises(ValueError):
+        YFinanceProvider().history(["AAPL", "MSFT"])
+    with pytest.raises(YFPricesMissingError):
+        YFinanceProvider().history(["MSFT"])
+
+
+def test_one_failing_symbol_does_not_sink_the_batch(stub_ticker):
+    stub_ticker.update(AAPL=frame([1.0]), MSFT=ValueError("Expecting value"))
+    assert list(YFinanceProvider().history(["AAPL", "MSFT"])) == ["AAPL"]
+
+
+def test_per_symbol_provider_gets_one_paced_upstream_call_per_symbol(service, provider):
+    provider.history_batch_size = 1
+    requested = []
+    history = provider.history
+
+    def recording_history(symbols, *args, **kwargs):
+        requested.append(list(symbols))
+        return history(symbols, *args, **kwargs)
+
+    provider.history = recording_history
+    histories, errors, _ = asyncio.run(
+        service._load_histories(["AAPL", "MSFT", "NVDA"])
+    )
+    assert sorted(histories) == ["AAPL", "MSFT", "NVDA"] and not errors
+    assert sorted(requested) == [["AAPL"], ["MSFT"], ["NVDA"]]
+    assert service._upstream.rate_limiter.acquired == 3
+
+
+def test_recording_provider_writes_a_replayable_dump_on_shutdown(tmp_path, monkeypatch):
+    path = str(tmp_path / "recording.json")
+    monkeypatch.setattr(settings, "RECORDING_PATH", path)
+    assert isinstance(providers.create_provider("recording"), RecordingProvider)
+
+    recorder = RecordingProvider(FakeProvider(seed=7), path)
+    service = MarketDataService(recorder)
+    try:
+        recorded = asyncio.run(service.get_stock_data("AAPL"))
+    finally:
+        service.shutdown()
+
+    replay = MarketDataService(FakeProvider(seed=0, replay_path=path))
+    try:
+        assert asyncio.run(replay.get_stock_data("AAPL")) == recorded
+    finally:
+        replay.shutdown()
@@ -0,0 +1,24 @@
+import asyncio
+
+from app import main
+
+
+def test_matching_etag_answers_304_and_reuses_the_serialized_body(client):
+    async def run():
+        async with client:
+            first = await client.get("/api/market/news")
+            assert first.status_code == 200 and first.content
+            etag = first.headers["etag"]
+            again = await client.get(
+                "/api/market/news", headers={"If-None-Match": f"W/{etag}"}
+            )
+            assert again.status_code == 304 and not again.content
+            assert again.headers["etag"] == etag
+            other = await client.get(
+                "/api/market/news", headers={"If-None-Match": '"other"'}
+            )
+            assert other.status_code == 200 and other.content == first.content
+
+    asyncio.run(run())
+    # The cached news list was serialized once for all three requests
+    assert main.response_cache.serialized == 1
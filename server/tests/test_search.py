@@ -0,0 +1,35 @@
+from app.services.search import TickerSearchIndex
+
+
+def listing(symbol, name):
+    return {"symbol": symbol, "name": name, "exchange": "NASDAQ", "type": "Equity"}
+
+
+LISTINGS = [
+    listing("AAPL", "Apple Inc."),
+    listing("APP", "AppLovin Corporation"),
+    listing("MSFT", "Microsoft Corporation"),
+    listing("MCD", "McDonald's Corporation"),
+    listing("PAPL", "Pineapple Energy"),
+]
+
+
+def symbols(results):
+    return [result["symbol"] for result in results]
+
+
+def test_ranking_is_exact_then_symbol_prefix_then_word_prefix_then_substring():
+    index = TickerSearchIndex(LISTINGS)
+    assert symbols(index.search("app")) == ["APP", "AAPL", "PAPL"]
+    assert symbols(index.search("a", limit=2)) == ["AAPL", "APP"]
+    assert symbols(index.search("corp")) == ["APP", "MSFT", "MCD"]
+    assert symbols(index.search("mcdonalds")) == ["MCD"]
+    assert symbols(index.search("pineapple", limit=1)) == ["PAPL"]
+
+
+def test_added_listing_is_found_and_cached_results_are_dropped():
+    index = TickerSearchIndex(LISTINGS)
+    assert index.search("zeta") == []
+    index.add(listing("ZETA", "Zeta Global"))
+    assert symbols(index.search("zeta")) == ["ZETA"]
+    assert len(index) == len(LISTINGS) + 1
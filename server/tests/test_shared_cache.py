@@ -0,0 +1,63 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+from app.core.config import settings
+from app.core.shared_cache import SharedCache
+from app.services.fake_provider import FakeProvider
+from app.services.market_data import MarketDataService
+
+
+def test_locked_database_degrades_instead_of_blocking(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    cache = SharedCache(path, busy_timeout=0.05)
+    cache.set("stock:AAPL", {"price": 1.0}, ttl_seconds=60)
+
+    # Another worker holding the write lock
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        cache.set("stock:MSFT", {"price": 2.0}, ttl_seconds=60)
+        assert cache.acquire("stock:MSFT", 15.0)
+        cache.release("stock:MSFT")
+        assert time.monotonic() - started < 1.0
+        assert cache.locked == 3
+        # WAL readers are not blocked by the writer
+        assert cache.get("stock:AAPL").data == {"price": 1.0}
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    assert cache.get("stock:MSFT") is None
+    assert cache.acquire("stock:MSFT", 15.0)
+    cache.close()
+
+
+def test_workers_share_entries_without_touching_sqlite_on_the_loop(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(settings, "SHARED_CACHE_PATH", str(tmp_path / "l2.sqlite3"))
+    threads = set()
+    get = SharedCache.get
+
+    def recording_get(self, key):
+        threads.add(threading.current_thread().name)
+        return get(self, key)
+
+    monkeypatch.setattr(SharedCache, "get", recording_get)
+    first, second = FakeProvider(), FakeProvider()
+    workers = [MarketDataService(first), MarketDataService(second)]
+
+    async def run():
+        stock = await workers[0].get_stock_data("AAPL")
+        assert await workers[1].get_stock_data("AAPL") == stock
+
+    try:
+        asyncio.run(run())
+    finally:
+        for worker in workers:
+            worker.shutdown()
+    assert sum(second.calls.values()) == 0
+    assert threads and all(name.startswith("shared-cache") for name in threads)
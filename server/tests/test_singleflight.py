@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_load():
+    flight = SingleFlight()
+    loads = 0
+
+    async def loader():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return loads
+
+    async def run():
+        results = await asyncio.gather(*[flight.do("k", loader) for _ in range(5)])
+        assert results == [1] * 5
+        # Done loads are forgotten; the next caller loads again
+        assert await flight.do("k", loader) == 2
+
+    asyncio.run(run())
+    assert flight.stats() == {"calls": 2, "shared": 4, "inflight": 0}
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_load():
+    flight = SingleFlight()
+
+    async def loader():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("k", loader))
+        second = asyncio.ensure_future(flight.do("k", loader))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == "done"
+
+    asyncio.run(run())
+
+
+def test_service_loads_a_symbol_once_for_concurrent_requests(service, provider):
+    async def run():
+        stocks = await asyncio.gather(
+            *[service.get_stock_data("AAPL") for _ in range(10)]
+        )
+        assert all(stock == stocks[0] for stock in stocks)
+
+    asyncio.run(run())
+    assert provider.calls["history"] == 1